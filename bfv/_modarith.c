@@ -0,0 +1,114 @@
+/*
+ * Batched reductions of int64 coefficients by a modulus, see `get_standard_form` and `get_centered_remainder` in bfv/utils.py.
+ *
+ * Each function makes a single pass over the coefficients: the remainder is brought into the target range with
+ * branchless conditional additions and subtractions, without the temporaries of the equivalent NumPy expressions.
+ * The modulus m must satisfy 0 < m < 2^63, out may be the input array itself.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+
+static void standard_form(const int64_t *a, int64_t *out, Py_ssize_t n, int64_t m)
+{
+    for (Py_ssize_t i = 0; i < n; i++) {
+        /* the C remainder has the sign of a[i], it lies in (-m, m) */
+        int64_t r = a[i] % m;
+        r += (r < 0) * m;
+        out[i] = r;
+    }
+}
+
+static void centered_remainder(const int64_t *a, int64_t *out, Py_ssize_t n, int64_t m)
+{
+    const int64_t half = m / 2;
+    for (Py_ssize_t i = 0; i < n; i++) {
+        int64_t r = a[i] % m;
+        r += (r < 0) * m;
+        r -= (r > half) * m;
+        out[i] = r;
+    }
+}
+
+/* Parse (arr, modulus, out), check that arr and out hold the same number of int64 values. Returns the number of values, -1 on error */
+static Py_ssize_t parse_arguments(PyObject *args, Py_buffer *a, Py_buffer *out, long long *m)
+{
+    if (!PyArg_ParseTuple(args, "y*Lw*", a, m, out)) {
+        return -1;
+    }
+    if (a->itemsize != sizeof(int64_t) || out->itemsize != sizeof(int64_t)) {
+        PyErr_SetString(PyExc_TypeError, "arr and out must hold int64 values");
+    } else if (a->len != out->len) {
+        PyErr_SetString(PyExc_ValueError, "arr and out must have the same length");
+    } else if (*m <= 0) {
+        PyErr_SetString(PyExc_ValueError, "modulus must be positive");
+    } else {
+        return a->len / a->itemsize;
+    }
+    PyBuffer_Release(a);
+    PyBuffer_Release(out);
+    return -1;
+}
+
+static PyObject *py_standard_form(PyObject *self, PyObject *args)
+{
+    Py_buffer a, out;
+    long long m;
+
+    Py_ssize_t n = parse_arguments(args, &a, &out, &m);
+    if (n < 0) {
+        return NULL;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    standard_form((const int64_t *)a.buf, (int64_t *)out.buf, n, (int64_t)m);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&a);
+    PyBuffer_Release(&out);
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *py_centered_remainder(PyObject *self, PyObject *args)
+{
+    Py_buffer a, out;
+    long long m;
+
+    Py_ssize_t n = parse_arguments(args, &a, &out, &m);
+    if (n < 0) {
+        return NULL;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    centered_remainder((const int64_t *)a.buf, (int64_t *)out.buf, n, (int64_t)m);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&a);
+    PyBuffer_Release(&out);
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyMethodDef modarith_methods[] = {
+    {"standard_form", py_standard_form, METH_VARARGS,
+     "standard_form(arr, modulus, out)\n--\n\n"
+     "Write the remainders of the int64 values arr modulo 0 < modulus < 2^63 in [0, modulus) to out."},
+    {"centered_remainder", py_centered_remainder, METH_VARARGS,
+     "centered_remainder(arr, modulus, out)\n--\n\n"
+     "Write the remainders of the int64 values arr modulo 0 < modulus < 2^63 in (-modulus/2, modulus/2] to out."},
+    {NULL, NULL, 0, NULL},
+};
+
+static struct PyModuleDef modarith_module = {
+    PyModuleDef_HEAD_INIT,
+    "_modarith",
+    "Batched modular reductions of int64 coefficients, see bfv/utils.py.",
+    -1,
+    modarith_methods,
+};
+
+PyMODINIT_FUNC PyInit__modarith(void)
+{
+    return PyModule_Create(&modarith_module);
+}
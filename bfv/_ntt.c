@@ -0,0 +1,443 @@
+/*
+ * Negacyclic NTT butterflies with Harvey's lazy reduction and Shoup's precomputed multipliers.
+ *
+ * Same algorithms as the Numba kernels `_ntt_ct`, `_intt_gs` and `_pointwise_mul_barrett` in bfv/ntt.py, the high 64 bits of the
+ * 128-bit products are computed with a single widening multiplication through __uint128_t.
+ * Values are uint64 modulo q < 2^62 so that the lazily reduced values in [0, 4q) fit in 64 bits.
+ *
+ * For q < 2^50 the lazily reduced values fit in 52 bits and, on CPUs supporting AVX-512 IFMA, the butterflies are computed
+ * 8 at a time with the 52-bit multiply-add instructions. The IFMA functions are compiled for their target only and selected
+ * at runtime, the scalar functions are used on every other CPU.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+
+#if defined(__x86_64__) && defined(__GNUC__)
+#define IFMA_BUILD 1
+#include <immintrin.h>
+#define IFMA_TARGET __attribute__((target("avx512f,avx512ifma")))
+#endif
+
+/* moduli up to this bit size keep the lazily reduced values in [0, 4q) below 2^52 */
+#define IFMA_MAX_BITS 50
+
+/* set at module initialization */
+static int ifma_supported = 0;
+
+static inline uint64_t mulhi(uint64_t a, uint64_t b)
+{
+    return (uint64_t)(((__uint128_t)a * b) >> 64);
+}
+
+/* w * y mod q in [0, 2q) given w_pre = floor(w * 2^64 / q) */
+static inline uint64_t mulmod_shoup(uint64_t w, uint64_t w_pre, uint64_t y, uint64_t q)
+{
+    return w * y - mulhi(w_pre, y) * q;
+}
+
+/* branchless conditional subtraction: if x < c, x - c wraps around to a larger value */
+static inline uint64_t reduce_once(uint64_t x, uint64_t c)
+{
+    uint64_t y = x - c;
+    return y < x ? y : x;
+}
+
+/* One stage of the forward NTT: m groups of t butterflies (X, Y) -> (X + WY, X - WY) with values in [0, 4q) */
+static void ntt_ct_stage(uint64_t *a, const uint64_t *psi, const uint64_t *psi_pre, uint64_t q, size_t m, size_t t)
+{
+    const uint64_t two_q = 2 * q;
+
+    for (size_t i = 0; i < m; i++) {
+        const size_t j1 = 2 * i * t;
+        const uint64_t w = psi[m + i];
+        const uint64_t w_pre = psi_pre[m + i];
+        uint64_t *x_ptr = a + j1;
+        uint64_t *y_ptr = a + j1 + t;
+        for (size_t j = 0; j < t; j++) {
+            const uint64_t x = reduce_once(x_ptr[j], two_q);
+            const uint64_t y = mulmod_shoup(w, w_pre, y_ptr[j], q);
+            x_ptr[j] = x + y;
+            y_ptr[j] = x - y + two_q;
+        }
+    }
+}
+
+/* One stage of the inverse NTT: h groups of t butterflies (X, Y) -> (X + Y, W(X - Y)) with values in [0, 2q) */
+static void intt_gs_stage(uint64_t *a, const uint64_t *inv_psi, const uint64_t *inv_psi_pre, uint64_t q, size_t h, size_t t)
+{
+    const uint64_t two_q = 2 * q;
+
+    for (size_t i = 0; i < h; i++) {
+        const size_t j1 = 2 * i * t;
+        const uint64_t w = inv_psi[h + i];
+        const uint64_t w_pre = inv_psi_pre[h + i];
+        uint64_t *x_ptr = a + j1;
+        uint64_t *y_ptr = a + j1 + t;
+        for (size_t j = 0; j < t; j++) {
+            const uint64_t x = x_ptr[j];
+            const uint64_t y = y_ptr[j];
+            x_ptr[j] = reduce_once(x + y, two_q);
+            y_ptr[j] = mulmod_shoup(w, w_pre, x - y + two_q, q);
+        }
+    }
+}
+
+/*
+ * In-place forward negacyclic NTT (Cooley-Tukey) of the n = 2^logn coefficients a in [0, 4q), lowest degree first.
+ * psi and psi_pre hold the powers of ψ in bit-reversed order and their Shoup multipliers.
+ * The NTT evaluations in [0, q) are written in bit-reversed order.
+ */
+static void ntt_ct_harvey(uint64_t *a, const uint64_t *psi, const uint64_t *psi_pre, uint64_t q, int logn)
+{
+    const size_t n = (size_t)1 << logn;
+    const uint64_t two_q = 2 * q;
+
+    size_t t = n;
+    for (size_t m = 1; m < n; m <<= 1) {
+        t >>= 1;
+        ntt_ct_stage(a, psi, psi_pre, q, m, t);
+    }
+
+    /* single final reduction from [0, 4q) to [0, q) */
+    for (size_t j = 0; j < n; j++) {
+        a[j] = reduce_once(reduce_once(a[j], two_q), q);
+    }
+}
+
+/*
+ * In-place inverse negacyclic NTT (Gentleman-Sande) of the n = 2^logn evaluations a in [0, 2q), in bit-reversed order.
+ * inv_psi and inv_psi_pre hold the powers of ψ^-1 in bit-reversed order and their Shoup multipliers.
+ * The coefficients in [0, q) are written lowest degree first.
+ */
+static void intt_gs_harvey(uint64_t *a, const uint64_t *inv_psi, const uint64_t *inv_psi_pre, uint64_t q,
+                           uint64_t n_inv, uint64_t n_inv_pre, int logn)
+{
+    const size_t n = (size_t)1 << logn;
+
+    size_t t = 1;
+    for (size_t m = n; m > 1; m >>= 1) {
+        intt_gs_stage(a, inv_psi, inv_psi_pre, q, m >> 1, t);
+        t <<= 1;
+    }
+
+    /* scale by n^-1 and bring the values from [0, 2q) to [0, q) */
+    for (size_t j = 0; j < n; j++) {
+        a[j] = reduce_once(mulmod_shoup(n_inv, n_inv_pre, a[j], q), q);
+    }
+}
+
+/*
+ * out = a * b mod q for the n values a, b in [0, q) and a modulus q of 33 to 62 bits, with Barrett multiplier mu = floor(2^(2L) / q).
+ * floor(floor(x / 2^(L-1)) * mu / 2^(L+1)) underestimates floor(x / q) by at most 2, the remainder is brought from [0, 3q) to [0, q).
+ */
+static void pointwise_mul_barrett(const uint64_t *a, const uint64_t *b, uint64_t *out, size_t n, uint64_t q, uint64_t mu)
+{
+    const int bits = 64 - __builtin_clzll(q);
+
+    for (size_t j = 0; j < n; j++) {
+        const __uint128_t x = (__uint128_t)a[j] * b[j];
+        const uint64_t q1 = (uint64_t)(x >> (bits - 1));
+        const uint64_t q3 = (uint64_t)(((__uint128_t)q1 * mu) >> (bits + 1));
+        const uint64_t r = (uint64_t)x - q3 * q;
+        out[j] = reduce_once(reduce_once(r, q), q);
+    }
+}
+
+#ifdef IFMA_BUILD
+
+/*
+ * w * y mod q in [0, 2q) for 8 values y < 2^52 given w_pre = floor(w * 2^52 / q).
+ * The quotient floor(w_pre * y / 2^52) is the high half of a 52-bit product, w * y - quotient * q lies in [0, 2q) < 2^52
+ * so it is computed exactly from the low 52 bits of the products.
+ */
+IFMA_TARGET static inline __m512i mulmod_shoup_ifma(__m512i w, __m512i w_pre, __m512i y, __m512i q)
+{
+    const __m512i zero = _mm512_setzero_si512();
+    const __m512i mask52 = _mm512_set1_epi64((1ULL << 52) - 1);
+    const __m512i quotient = _mm512_madd52hi_epu64(zero, w_pre, y);
+    const __m512i wy = _mm512_madd52lo_epu64(zero, w, y);
+    const __m512i quotient_q = _mm512_madd52lo_epu64(zero, quotient, q);
+    return _mm512_and_si512(_mm512_sub_epi64(wy, quotient_q), mask52);
+}
+
+IFMA_TARGET static inline __m512i reduce_once_ifma(__m512i x, __m512i c)
+{
+    return _mm512_min_epu64(x, _mm512_sub_epi64(x, c));
+}
+
+/*
+ * The Shoup multipliers of the tables are floor(w * 2^64 / q), the 52-bit ones are floor(w * 2^52 / q),
+ * namely the 64-bit ones shifted right by 12 bits.
+ */
+
+/* One stage of the forward NTT for t >= 8, see ntt_ct_stage */
+IFMA_TARGET static void ntt_ct_stage_ifma(uint64_t *a, const uint64_t *psi, const uint64_t *psi_pre, uint64_t q, size_t m, size_t t)
+{
+    const __m512i vq = _mm512_set1_epi64(q);
+    const __m512i v_two_q = _mm512_set1_epi64(2 * q);
+
+    for (size_t i = 0; i < m; i++) {
+        const size_t j1 = 2 * i * t;
+        const __m512i w = _mm512_set1_epi64(psi[m + i]);
+        const __m512i w_pre = _mm512_set1_epi64(psi_pre[m + i] >> 12);
+        uint64_t *x_ptr = a + j1;
+        uint64_t *y_ptr = a + j1 + t;
+        for (size_t j = 0; j < t; j += 8) {
+            __m512i x = _mm512_loadu_si512(x_ptr + j);
+            __m512i y = _mm512_loadu_si512(y_ptr + j);
+            x = reduce_once_ifma(x, v_two_q);
+            y = mulmod_shoup_ifma(w, w_pre, y, vq);
+            _mm512_storeu_si512(x_ptr + j, _mm512_add_epi64(x, y));
+            _mm512_storeu_si512(y_ptr + j, _mm512_add_epi64(_mm512_sub_epi64(x, y), v_two_q));
+        }
+    }
+}
+
+/* One stage of the inverse NTT for t >= 8, see intt_gs_stage */
+IFMA_TARGET static void intt_gs_stage_ifma(uint64_t *a, const uint64_t *inv_psi, const uint64_t *inv_psi_pre, uint64_t q, size_t h, size_t t)
+{
+    const __m512i vq = _mm512_set1_epi64(q);
+    const __m512i v_two_q = _mm512_set1_epi64(2 * q);
+
+    for (size_t i = 0; i < h; i++) {
+        const size_t j1 = 2 * i * t;
+        const __m512i w = _mm512_set1_epi64(inv_psi[h + i]);
+        const __m512i w_pre = _mm512_set1_epi64(inv_psi_pre[h + i] >> 12);
+        uint64_t *x_ptr = a + j1;
+        uint64_t *y_ptr = a + j1 + t;
+        for (size_t j = 0; j < t; j += 8) {
+            const __m512i x = _mm512_loadu_si512(x_ptr + j);
+            const __m512i y = _mm512_loadu_si512(y_ptr + j);
+            _mm512_storeu_si512(x_ptr + j, reduce_once_ifma(_mm512_add_epi64(x, y), v_two_q));
+            _mm512_storeu_si512(y_ptr + j, mulmod_shoup_ifma(w, w_pre, _mm512_add_epi64(_mm512_sub_epi64(x, y), v_two_q), vq));
+        }
+    }
+}
+
+/* ntt_ct_harvey for q < 2^50 and n >= 16, the stages with t < 8 butterflies per group are scalar */
+IFMA_TARGET static void ntt_ct_harvey_ifma(uint64_t *a, const uint64_t *psi, const uint64_t *psi_pre, uint64_t q, int logn)
+{
+    const size_t n = (size_t)1 << logn;
+    const __m512i vq = _mm512_set1_epi64(q);
+    const __m512i v_two_q = _mm512_set1_epi64(2 * q);
+
+    size_t t = n;
+    for (size_t m = 1; m < n; m <<= 1) {
+        t >>= 1;
+        if (t >= 8) {
+            ntt_ct_stage_ifma(a, psi, psi_pre, q, m, t);
+        } else {
+            ntt_ct_stage(a, psi, psi_pre, q, m, t);
+        }
+    }
+
+    for (size_t j = 0; j < n; j += 8) {
+        const __m512i x = _mm512_loadu_si512(a + j);
+        _mm512_storeu_si512(a + j, reduce_once_ifma(reduce_once_ifma(x, v_two_q), vq));
+    }
+}
+
+/* intt_gs_harvey for q < 2^50 and n >= 16, the stages with t < 8 butterflies per group are scalar */
+IFMA_TARGET static void intt_gs_harvey_ifma(uint64_t *a, const uint64_t *inv_psi, const uint64_t *inv_psi_pre, uint64_t q,
+                                            uint64_t n_inv, uint64_t n_inv_pre, int logn)
+{
+    const size_t n = (size_t)1 << logn;
+    const __m512i vq = _mm512_set1_epi64(q);
+    const __m512i v_n_inv = _mm512_set1_epi64(n_inv);
+    const __m512i v_n_inv_pre = _mm512_set1_epi64(n_inv_pre >> 12);
+
+    size_t t = 1;
+    for (size_t m = n; m > 1; m >>= 1) {
+        if (t >= 8) {
+            intt_gs_stage_ifma(a, inv_psi, inv_psi_pre, q, m >> 1, t);
+        } else {
+            intt_gs_stage(a, inv_psi, inv_psi_pre, q, m >> 1, t);
+        }
+        t <<= 1;
+    }
+
+    for (size_t j = 0; j < n; j += 8) {
+        const __m512i x = _mm512_loadu_si512(a + j);
+        _mm512_storeu_si512(a + j, reduce_once_ifma(mulmod_shoup_ifma(v_n_inv, v_n_inv_pre, x, vq), vq));
+    }
+}
+
+/* Whether the IFMA functions can be used for the modulus q and the size n = 2^logn */
+static int use_ifma(uint64_t q, int logn)
+{
+    return ifma_supported && (q >> IFMA_MAX_BITS) == 0 && logn >= 4;
+}
+
+#endif
+
+/* Check that the buffer holds a power of 2 number of uint64 values and return log2 of that number, -1 on error */
+static int buffer_log_length(const Py_buffer *buffer, const char *name)
+{
+    if (buffer->itemsize != sizeof(uint64_t)) {
+        PyErr_Format(PyExc_TypeError, "%s must hold uint64 values", name);
+        return -1;
+    }
+    Py_ssize_t n = buffer->len / buffer->itemsize;
+    if (n == 0 || (n & (n - 1)) != 0) {
+        PyErr_Format(PyExc_ValueError, "the length of %s must be a power of 2", name);
+        return -1;
+    }
+    int logn = 0;
+    while (((Py_ssize_t)1 << logn) < n) {
+        logn++;
+    }
+    return logn;
+}
+
+/* Check that the table holds at least n uint64 values */
+static int check_table(const Py_buffer *buffer, Py_ssize_t n, const char *name)
+{
+    if (buffer->itemsize != sizeof(uint64_t) || buffer->len / buffer->itemsize < n) {
+        PyErr_Format(PyExc_ValueError, "%s must hold at least n uint64 values", name);
+        return -1;
+    }
+    return 0;
+}
+
+static PyObject *py_ntt_ct_harvey(PyObject *self, PyObject *args)
+{
+    Py_buffer a, psi, psi_pre;
+    unsigned long long q;
+    PyObject *result = NULL;
+
+    if (!PyArg_ParseTuple(args, "w*y*y*K", &a, &psi, &psi_pre, &q)) {
+        return NULL;
+    }
+
+    int logn = buffer_log_length(&a, "a");
+    if (logn >= 0 && check_table(&psi, (Py_ssize_t)1 << logn, "psi") == 0
+        && check_table(&psi_pre, (Py_ssize_t)1 << logn, "psi_pre") == 0) {
+        Py_BEGIN_ALLOW_THREADS
+#ifdef IFMA_BUILD
+        if (use_ifma(q, logn)) {
+            ntt_ct_harvey_ifma((uint64_t *)a.buf, (const uint64_t *)psi.buf, (const uint64_t *)psi_pre.buf, (uint64_t)q, logn);
+        } else
+#endif
+        {
+            ntt_ct_harvey((uint64_t *)a.buf, (const uint64_t *)psi.buf, (const uint64_t *)psi_pre.buf, (uint64_t)q, logn);
+        }
+        Py_END_ALLOW_THREADS
+        Py_INCREF(Py_None);
+        result = Py_None;
+    }
+
+    PyBuffer_Release(&a);
+    PyBuffer_Release(&psi);
+    PyBuffer_Release(&psi_pre);
+    return result;
+}
+
+static PyObject *py_intt_gs_harvey(PyObject *self, PyObject *args)
+{
+    Py_buffer a, inv_psi, inv_psi_pre;
+    unsigned long long q, n_inv, n_inv_pre;
+    PyObject *result = NULL;
+
+    if (!PyArg_ParseTuple(args, "w*y*y*KKK", &a, &inv_psi, &inv_psi_pre, &q, &n_inv, &n_inv_pre)) {
+        return NULL;
+    }
+
+    int logn = buffer_log_length(&a, "a");
+    if (logn >= 0 && check_table(&inv_psi, (Py_ssize_t)1 << logn, "inv_psi") == 0
+        && check_table(&inv_psi_pre, (Py_ssize_t)1 << logn, "inv_psi_pre") == 0) {
+        Py_BEGIN_ALLOW_THREADS
+#ifdef IFMA_BUILD
+        if (use_ifma(q, logn)) {
+            intt_gs_harvey_ifma((uint64_t *)a.buf, (const uint64_t *)inv_psi.buf, (const uint64_t *)inv_psi_pre.buf, (uint64_t)q,
+                                (uint64_t)n_inv, (uint64_t)n_inv_pre, logn);
+        } else
+#endif
+        {
+            intt_gs_harvey((uint64_t *)a.buf, (const uint64_t *)inv_psi.buf, (const uint64_t *)inv_psi_pre.buf, (uint64_t)q,
+                           (uint64_t)n_inv, (uint64_t)n_inv_pre, logn);
+        }
+        Py_END_ALLOW_THREADS
+        Py_INCREF(Py_None);
+        result = Py_None;
+    }
+
+    PyBuffer_Release(&a);
+    PyBuffer_Release(&inv_psi);
+    PyBuffer_Release(&inv_psi_pre);
+    return result;
+}
+
+static PyObject *py_pointwise_mul_barrett(PyObject *self, PyObject *args)
+{
+    Py_buffer a, b, out;
+    unsigned long long q, mu;
+    PyObject *result = NULL;
+
+    if (!PyArg_ParseTuple(args, "y*y*w*KK", &a, &b, &out, &q, &mu)) {
+        return NULL;
+    }
+
+    if (a.itemsize != sizeof(uint64_t) || b.itemsize != sizeof(uint64_t) || out.itemsize != sizeof(uint64_t)) {
+        PyErr_SetString(PyExc_TypeError, "a, b and out must hold uint64 values");
+    } else if (a.len != b.len || a.len != out.len) {
+        PyErr_SetString(PyExc_ValueError, "a, b and out must have the same length");
+    } else if ((q >> 32) == 0 || (q >> 62) != 0) {
+        PyErr_SetString(PyExc_ValueError, "q must have 33 to 62 bits");
+    } else {
+        Py_BEGIN_ALLOW_THREADS
+        pointwise_mul_barrett((const uint64_t *)a.buf, (const uint64_t *)b.buf, (uint64_t *)out.buf, (size_t)(a.len / a.itemsize),
+                              (uint64_t)q, (uint64_t)mu);
+        Py_END_ALLOW_THREADS
+        Py_INCREF(Py_None);
+        result = Py_None;
+    }
+
+    PyBuffer_Release(&a);
+    PyBuffer_Release(&b);
+    PyBuffer_Release(&out);
+    return result;
+}
+
+static PyMethodDef ntt_methods[] = {
+    {"ntt_ct_harvey", py_ntt_ct_harvey, METH_VARARGS,
+     "ntt_ct_harvey(a, psi, psi_pre, q)\n--\n\n"
+     "In-place forward negacyclic NTT of the uint64 coefficients a in [0, 4q) modulo q < 2^62.\n"
+     "Uses AVX-512 IFMA when IFMA_SUPPORTED is set, q < 2^50 and n >= 16."},
+    {"intt_gs_harvey", py_intt_gs_harvey, METH_VARARGS,
+     "intt_gs_harvey(a, inv_psi, inv_psi_pre, q, n_inv, n_inv_pre)\n--\n\n"
+     "In-place inverse negacyclic NTT of the uint64 evaluations a in [0, 2q) modulo q < 2^62.\n"
+     "Uses AVX-512 IFMA when IFMA_SUPPORTED is set, q < 2^50 and n >= 16."},
+    {"pointwise_mul_barrett", py_pointwise_mul_barrett, METH_VARARGS,
+     "pointwise_mul_barrett(a, b, out, q, mu)\n--\n\n"
+     "Write the products modulo q of the uint64 NTT evaluations a and b in [0, q) to out, for 2^32 <= q < 2^62.\n"
+     "mu is the Barrett multiplier floor(2^(2L) / q) of the L-bit modulus q."},
+    {NULL, NULL, 0, NULL},
+};
+
+static struct PyModuleDef ntt_module = {
+    PyModuleDef_HEAD_INIT,
+    "_ntt",
+    "Negacyclic NTT with Harvey's butterflies, see bfv/ntt.py.",
+    -1,
+    ntt_methods,
+};
+
+PyMODINIT_FUNC PyInit__ntt(void)
+{
+#ifdef IFMA_BUILD
+    __builtin_cpu_init();
+    ifma_supported = __builtin_cpu_supports("avx512f") && __builtin_cpu_supports("avx512ifma");
+#endif
+
+    PyObject *module = PyModule_Create(&ntt_module);
+    if (module == NULL) {
+        return NULL;
+    }
+    if (PyModule_AddIntConstant(module, "IFMA_SUPPORTED", ifma_supported) < 0
+        || PyModule_AddIntConstant(module, "IFMA_MAX_BITS", IFMA_MAX_BITS) < 0) {
+        Py_DECREF(module);
+        return NULL;
+    }
+    return module;
+}
@@ -1,7 +1,8 @@
-from .polynomial import PolynomialRing, Polynomial, get_centered_remainder
+from .polynomial import PolynomialRing, Polynomial, INT64_COEFFICIENT_BOUND, get_centered_remainder, into_coefficient_array, pad_coefficients
 from .discrete_gauss import DiscreteGaussian
 from .crt import CRTModuli, CRTPolynomial
-from .ntt import ntt_poly_mul_centered_remainder
+import math
+from typing import NamedTuple, Optional
 import numpy as np
 from decimal import Decimal
 
@@ -30,7 +31,7 @@ class RLWE:
         assert t > 1, "modulus t must be > 1"
 
         # Ensure that q and t are coprime
-        assert np.gcd(q, t) == 1, "modulus q and t must be coprime"
+        assert math.gcd(q, t) == 1, "modulus q and t must be coprime"
 
         self.n = n
         self.Rq = PolynomialRing(n, q)
@@ -45,11 +46,10 @@ class RLWE:
         Returns: Sampled polynomial.
         """
 
-        coefficients = np.random.choice([-1, 0, 1], size=self.n)
+        # integers(-1, 2) samples uniformly from {-1, 0, 1}
+        coefficients = np.random.default_rng().integers(-1, 2, size=self.n, dtype=np.int64)
 
-        coefficients_int = [int(coeff) for coeff in coefficients]
-
-        return Polynomial(coefficients_int)
+        return Polynomial(coefficients)
 
     def SampleFromErrorDistribution(self) -> Polynomial:
         """
@@ -58,11 +58,92 @@ class RLWE:
         Returns: Sampled polynomial.
         """
         # Sample a polynomial from the Error distribution
-        coefficients = self.distribution.sample(self.n)
+        # the samples are integer valued floats
+        coefficients = self.distribution.sample(self.n).astype(np.int64)
+
+        return Polynomial(coefficients)
+
+class PublicKey(NamedTuple):
+    """
+    Public key (pk0, pk1) = (a*s + e, -a) living in the ring Rq.
+    The NTT evaluations of pk0 and pk1 are computed once by `PublicKeyGen` and cached on the polynomials, so that encryptions only transform u.
+    """
+    pk0: Polynomial
+    pk1: Polynomial
+
+class Ciphertext:
+    def __init__(self, data: np.ndarray, ring: PolynomialRing, bound: Optional[int] = None):
+        """
+        Initialize a ciphertext (ct0, ct1) living in the ring Rq.
+        The coefficients of ct0 and ct1 (starting from the highest degree coefficient) are stored as the two rows of a single 2 x n array,
+        so that ciphertext additions and subtractions are performed as a single array operation.
+
+        - bound: bound on the absolute value of the coefficients. By default the coefficients are assumed to be reduced in Rq.
+
+        The reduction of the coefficients by the modulus of Rq is deferred: additions and subtractions don't reduce their result
+        as long as the bound of the coefficients guarantees that the next operation can't overflow int64.
+        Indexing and unpacking a ciphertext reduces the coefficients and returns ct0 and ct1 as polynomials in Rq.
+        """
+        assert data.shape == (2, ring.n), "the data of a ciphertext must be a 2 x n array"
+
+        self.data = data
+        self.ring = ring
+        self.bound = ring.modulus // 2 if bound is None else bound
+
+    @staticmethod
+    def from_polynomials(ct0: Polynomial, ct1: Polynomial, ring: PolynomialRing) -> "Ciphertext":
+        """
+        Pack the polynomials ct0 and ct1 into a ciphertext in the ring Rq.
+        The polynomials are reduced by the cyclotomic polynomial of Rq, the reduction by the modulus is deferred.
+        """
+        rows = []
+        for ct in (ct0, ct1):
+            coefficients = ct.coefficients
+            if len(coefficients) > ring.n:
+                folded = Polynomial(coefficients)
+                folded.reduce_coefficients_by_cyclo(ring.denominator)
+                coefficients = folded.coefficients
+            rows.append(pad_coefficients(coefficients, ring.n))
+
+        # int64 coefficients are bounded by 2^62, see `into_coefficient_array`
+        data = into_coefficient_array(np.stack(rows))
+
+        return Ciphertext(data, ring, int(np.abs(data).max()))
 
-        coefficients_int = [int(coeff) for coeff in coefficients]
+    def reduce(self) -> None:
+        """
+        Reduce the coefficients of the ciphertext by the modulus of Rq.
+        """
+        if self.bound > self.ring.modulus // 2:
+            self.data = get_centered_remainder(self.data, self.ring.modulus)
+            self.bound = self.ring.modulus // 2
+
+    def __getitem__(self, index: int) -> Polynomial:
+        self.reduce()
+        return Polynomial(self.data[index], self.ring)
+
+    def __len__(self) -> int:
+        return 2
+
+    def __iter__(self):
+        return iter((self[0], self[1]))
+
+    def __add__(self, other: "Ciphertext") -> "Ciphertext":
+        return self.lazy_result(self.data + other.data, self.bound + other.bound)
+
+    def __sub__(self, other: "Ciphertext") -> "Ciphertext":
+        return self.lazy_result(self.data - other.data, self.bound + other.bound)
 
-        return Polynomial(coefficients_int)
+    def lazy_result(self, data: np.ndarray, bound: int) -> "Ciphertext":
+        """
+        Wrap the unreduced result of an operation into a ciphertext.
+        int64 coefficients are reduced once their bound reaches 2^62 so that adding or subtracting two ciphertexts never overflows.
+        Python integers don't overflow, their reduction is always deferred.
+        """
+        result = Ciphertext(data, self.ring, bound)
+        if data.dtype != object and bound >= INT64_COEFFICIENT_BOUND:
+            result.reduce()
+        return result
 
 class BFV:
     def __init__(self, rlwe: RLWE):
@@ -85,7 +166,7 @@ class BFV:
 
     def PublicKeyGen(
         self, s: Polynomial, e: Polynomial, a: Polynomial
-    ) -> tuple[Polynomial, Polynomial]:
+    ) -> PublicKey:
         """
         Generate a public key from a given secret key.
 
@@ -107,22 +188,27 @@ class BFV:
         pk0 = b
         pk0.reduce_in_ring(self.rlwe.Rq)
 
-        # pk1 = -a.
-        pk1 = a 
-        pk1 = pk1.scalar_mul(-1)
+        # pk1 = -a. The NTT evaluations of a computed for a*s are negated as well
+        pk1 = -a
+        pk1.reduce_in_ring(self.rlwe.Rq)
 
-        public_key = (pk0, pk1)
+        # the public key is used in every encryption, transform it once so that encryptions only pay for the transform of u
+        if self.rlwe.Rq.ntt_tables is not None:
+            pk0.to_ntt(self.rlwe.Rq)
+            pk1.to_ntt(self.rlwe.Rq)
+
+        public_key = PublicKey(pk0, pk1)
 
         return public_key
 
     def PubKeyEncrypt(
         self,
-        public_key: tuple[Polynomial, Polynomial],
+        public_key: PublicKey,
         m: Polynomial,
         e0: Polynomial,
         e1: Polynomial,
         u: Polynomial,
-    ) -> tuple[Polynomial, Polynomial]:
+    ) -> Ciphertext:
         """
         Encrypt a given message m with a given public_key .
 
@@ -139,7 +225,7 @@ class BFV:
         
         # scale the message as round(Q*m/t)
         factor = Decimal(self.rlwe.Rq.modulus) / Decimal(self.rlwe.Rt.modulus)
-        scaled_message = [round(coeff * factor) for coeff in m.coefficients]
+        scaled_message = [round(coeff * factor) for coeff in m.coefficients.tolist()]
 
         # pk0 * u
         pk0_u = public_key[0] * u
@@ -147,19 +233,14 @@ class BFV:
         # scaled_message + pk0 * u + e0
         ct_0 = Polynomial(scaled_message) + pk0_u + e0
 
-        # ct_0 will be in Rq
-        ct_0.reduce_in_ring(self.rlwe.Rq)
-
         # pk1 * u
         pk1_u = public_key[1] * u
 
         # pk1 * u + e1
         ct_1 = pk1_u + e1
 
-        # The result will be in Rq
-        ct_1.reduce_in_ring(self.rlwe.Rq)
-
-        ciphertext = (ct_0, ct_1)
+        # ct_0 and ct_1 will be in Rq, their reduction by the modulus is deferred until they are accessed
+        ciphertext = Ciphertext.from_polynomials(ct_0, ct_1, self.rlwe.Rq)
 
         return ciphertext
 
@@ -169,7 +250,7 @@ class BFV:
         m: Polynomial,
         a: Polynomial,
         e: Polynomial,
-    ) -> tuple[Polynomial, Polynomial]:
+    ) -> Ciphertext:
         """
         Encrypt a given message m with a given secret key .
 
@@ -185,7 +266,7 @@ class BFV:
 
         # scale the message as round(Q*m/t)
         factor = Decimal(self.rlwe.Rq.modulus) / Decimal(self.rlwe.Rt.modulus)
-        scaled_message = [round(coeff * factor) for coeff in m.coefficients]
+        scaled_message = [round(coeff * factor) for coeff in m.coefficients.tolist()]
 
         # a * s
         mul = a * secret_key
@@ -196,20 +277,17 @@ class BFV:
         # ct_0 = a*s + e + scaled_message
         ct_0 = b + Polynomial(scaled_message)
 
-        # ct_0 will be in Rq
-        ct_0.reduce_in_ring(self.rlwe.Rq)
-
         # ct_1 = -a
-        ct_1 = a 
-        ct_1 = ct_1.scalar_mul(-1)
+        ct_1 = -a
 
-        ciphertext = (ct_0, ct_1)
+        # ct_0 and ct_1 will be in Rq, their reduction by the modulus is deferred until they are accessed
+        ciphertext = Ciphertext.from_polynomials(ct_0, ct_1, self.rlwe.Rq)
 
-        return (ciphertext)
+        return ciphertext
 
     def PubKeyEncryptConst(
         self,
-        public_key: tuple[Polynomial, Polynomial],
+        public_key: PublicKey,
         m: Polynomial,
         u: Polynomial,
     ):
@@ -227,7 +305,7 @@ class BFV:
 
         # scale the message as round(Q*m/t)
         factor = Decimal(self.rlwe.Rq.modulus) / Decimal(self.rlwe.Rt.modulus)
-        scaled_message = [round(coeff * factor) for coeff in m.coefficients]
+        scaled_message = [round(coeff * factor) for coeff in m.coefficients.tolist()]
 
         # pk0 * u
         pk0_u = public_key[0] * u
@@ -235,26 +313,21 @@ class BFV:
         # scaled_message + pk0 * u 
         ct_0 = Polynomial(scaled_message) + pk0_u 
 
-        # ct_0 will be in Rq
-        ct_0.reduce_in_ring(self.rlwe.Rq)
-
         # pk1 * u
         pk1_u = public_key[1] * u
 
         # pk1 * u 
         ct_1 = pk1_u 
 
-        # The result will be in Rq
-        ct_1.reduce_in_ring(self.rlwe.Rq)
-
-        ciphertext = (ct_0, ct_1)
+        # ct_0 and ct_1 will be in Rq, their reduction by the modulus is deferred until they are accessed
+        ciphertext = Ciphertext.from_polynomials(ct_0, ct_1, self.rlwe.Rq)
 
         return ciphertext
 
     def Decrypt(
         self,
         secret_key: Polynomial,
-        ciphertext: tuple[Polynomial, Polynomial],
+        ciphertext: Ciphertext,
     ):
         """
         Decrypt a given ciphertext (encrypted using public key encryption) with a given secret key.
@@ -280,16 +353,13 @@ class BFV:
         # reduce the numerator in Rq
         numerator.reduce_in_ring(self.rlwe.Rq)
 
-        # scale the num down by t/q 
-        num = [coeff * t for coeff in numerator.coefficients]
-
-        quotient = [coeff / q for coeff in num]
-
-        # round the coefficients of quotient to the nearest integer
-        quotient = [round(coeff) for coeff in quotient]
+        # scale the numerator down by t/q and round the coefficients to the nearest integer, exactly, as floor((t*x + q//2) / q)
+        # int64 arithmetic is used when t*x + q//2 can't overflow, Python integers otherwise
+        num = numerator.coefficients
+        if num.dtype == object or (t * q).bit_length() >= 63:
+            num = num.astype(object)
 
-        # trim leading zeros
-        quotient = np.trim_zeros(quotient, "f")
+        quotient = (num * t + q // 2) // q
 
         quotient_poly = Polynomial(quotient)
 
@@ -300,8 +370,8 @@ class BFV:
 
     def EvalAdd(
         self,
-        ciphertext1: tuple[Polynomial, Polynomial],
-        ciphertext2: tuple[Polynomial, Polynomial],
+        ciphertext1: Ciphertext,
+        ciphertext2: Ciphertext,
     ):
         """
         Add two ciphertexts.
@@ -313,20 +383,13 @@ class BFV:
         Returns:
         ciphertext_sum: Sum of the two ciphertexts.
         """
-        # ct1_0 + ct2_0
-        ct0 = ciphertext1[0] + ciphertext2[0]
-        ct0.reduce_in_ring(self.rlwe.Rq)
-
-        # ct1_1 + ct2_1
-        ct1 = ciphertext1[1] + ciphertext2[1]
-        ct1.reduce_in_ring(self.rlwe.Rq)
-
-        return (ct0, ct1)
+        # (ct1_0 + ct2_0, ct1_1 + ct2_1) reduced in Rq
+        return ciphertext1 + ciphertext2
     
     def EvalSub(
         self,
-        ciphertext1: tuple[Polynomial, Polynomial],
-        ciphertext2: tuple[Polynomial, Polynomial],
+        ciphertext1: Ciphertext,
+        ciphertext2: Ciphertext,
     ):
         """
         Subtract two ciphertexts.
@@ -338,15 +401,8 @@ class BFV:
         Returns:
         ciphertext_difference: Difference of the two ciphertexts.
         """
-        # ct1_0 - ct2_0
-        ct0 = ciphertext1[0] - ciphertext2[0]
-        ct0.reduce_in_ring(self.rlwe.Rq)
-
-        # ct1_1 - ct2_1
-        ct1 = ciphertext1[1] - ciphertext2[1]
-        ct1.reduce_in_ring(self.rlwe.Rq)
-
-        return (ct0, ct1)
+        # (ct1_0 - ct2_0, ct1_1 - ct2_1) reduced in Rq
+        return ciphertext1 - ciphertext2
     
 class BFVCrt:
     def __init__(self, crt_moduli: CRTModuli, n: int, t: int, discrete_gauss: DiscreteGaussian):
@@ -363,6 +419,9 @@ class BFVCrt:
         by its CRT components {xi = x mod qi ∈ Zqi }i, and operations on x in Zq can
         be implemented by applying the same operations to each CRT component xi
         in its own ring Zqi
+
+        Each qi fits in a machine word, so the coefficients of the polynomials in Rqi are stored as int64 and
+        the polynomials are multiplied via negacyclic NTT in Rqi.
         """
         self.crt_moduli = crt_moduli
         self.bfv_q = BFV(RLWE(n, crt_moduli.q, t, discrete_gauss))
@@ -382,7 +441,7 @@ class BFVCrt:
 
     def PublicKeyGen(
         self, s: Polynomial, e: Polynomial, ais: list[Polynomial]
-    ) -> tuple[Polynomial, Polynomial]:
+    ) -> list[PublicKey]:
         """
         Generate a set of public keys for each crt basis from a given secret key.
 
@@ -398,11 +457,10 @@ class BFVCrt:
 
         for i in range(len(self.crt_moduli.qis)):
 
-            a = ais[i]
+            a = Polynomial(ais[i].coefficients, self.bfv_qis[i].rlwe.Rq)
 
-            # a * s
-            mul = ntt_poly_mul_centered_remainder(a.coefficients, s.coefficients, self.bfv_q.rlwe.n * 2, self.crt_moduli.qis[i])
-            mul = Polynomial(mul)
+            # a * s in Rqi
+            mul = a * s
 
             # b = a*s + e.
             b = mul + e
@@ -411,11 +469,16 @@ class BFVCrt:
             pk0 = b
             pk0.reduce_in_ring(self.bfv_qis[i].rlwe.Rq)
 
-            # pk1 = -a.
-            pk1 = a
-            pk1 = pk1.scalar_mul(-1)
+            # pk1 = -a. The NTT evaluations of a computed for a*s are negated as well
+            pk1 = -a
+            pk1.reduce_in_ring(self.bfv_qis[i].rlwe.Rq)
 
-            public_key = (pk0, pk1)
+            # transform the public key once, see BFV.PublicKeyGen
+            if self.bfv_qis[i].rlwe.Rq.ntt_tables is not None:
+                pk0.to_ntt(self.bfv_qis[i].rlwe.Rq)
+                pk1.to_ntt(self.bfv_qis[i].rlwe.Rq)
+
+            public_key = PublicKey(pk0, pk1)
 
             public_keys.append(public_key)
         
@@ -423,12 +486,12 @@ class BFVCrt:
     
     def PubKeyEncrypt(
         self,
-        public_keys: tuple[Polynomial, Polynomial],
+        public_keys: list[PublicKey],
         m: Polynomial,
         e0: Polynomial,
         e1: Polynomial,
         u: Polynomial,
-    ) -> list[tuple[Polynomial, Polynomial]]:
+    ) -> list[Ciphertext]:
         """
         Encrypt a given message m with a given list of public_keys.
 
@@ -452,27 +515,20 @@ class BFVCrt:
             negative_mod_inverse_t = pow(-1 * self.bfv_q.rlwe.Rt.modulus, -1, self.crt_moduli.qis[i])
             scaled_message = partial_scaled_message.scalar_mul(negative_mod_inverse_t)
             
-            # pk0 * u
-            pk0_u = ntt_poly_mul_centered_remainder(public_key_qi[0].coefficients, u.coefficients, self.bfv_q.rlwe.n * 2, self.crt_moduli.qis[i])
-            pk0_u = Polynomial(pk0_u)
+            # pk0 * u in Rqi
+            pk0_u = public_key_qi[0] * u
 
             # scaled_message + pk0 * u + e0
             ct_0 = scaled_message + pk0_u + e0
 
-            # ct_0 will be in Rqi
-            ct_0.reduce_in_ring(self.bfv_qis[i].rlwe.Rq)
-
-            # pk1 * u
-            pk1_u = ntt_poly_mul_centered_remainder(public_key_qi[1].coefficients, u.coefficients, self.bfv_q.rlwe.n * 2, self.crt_moduli.qis[i])
-            pk1_u = Polynomial(pk1_u)
+            # pk1 * u in Rqi
+            pk1_u = public_key_qi[1] * u
 
             # pk1 * u + e1
             ct_1 = pk1_u + e1
 
-            # The result will be in Rqi
-            ct_1.reduce_in_ring(self.bfv_qis[i].rlwe.Rq)
-
-            ciphertext = (ct_0, ct_1)
+            # ct_0 and ct_1 will be in Rqi, their reduction by the modulus is deferred until they are accessed
+            ciphertext = Ciphertext.from_polynomials(ct_0, ct_1, self.bfv_qis[i].rlwe.Rq)
 
             ciphertexts.append(ciphertext)
 
@@ -484,7 +540,7 @@ class BFVCrt:
         ais: list[Polynomial],
         e: Polynomial,
         m: Polynomial,
-    ) -> list[tuple[Polynomial, Polynomial]]:
+    ) -> list[Ciphertext]:
         """
         Encrypt a given message m with a given secret key .
 
@@ -510,9 +566,8 @@ class BFVCrt:
 
             scaled_message = partial_scaled_message.scalar_mul(scaling_factor_den)
 
-            # a * s
-            mul = ntt_poly_mul_centered_remainder(a.coefficients, s.coefficients, self.bfv_q.rlwe.n * 2, self.crt_moduli.qis[i])
-            mul = Polynomial(mul)
+            # a * s in Rqi
+            mul = Polynomial(a.coefficients, self.bfv_qis[i].rlwe.Rq) * s
 
             # b = a*s + e.
             b = mul + e
@@ -520,14 +575,11 @@ class BFVCrt:
             # ct_0 = a*s + e + scaled_message
             ct_0 = b + scaled_message
 
-            # ct_0 will be in Rqi
-            ct_0.reduce_in_ring(self.bfv_qis[i].rlwe.Rq)
-
             # ct_1 = -a
-            ct_1 = a
-            ct_1 = ct_1.scalar_mul(-1)
+            ct_1 = -a
 
-            ciphertext = (ct_0, ct_1)
+            # ct_0 and ct_1 will be in Rqi, their reduction by the modulus is deferred until they are accessed
+            ciphertext = Ciphertext.from_polynomials(ct_0, ct_1, self.bfv_qis[i].rlwe.Rq)
 
             ciphertexts.append(ciphertext)
 
@@ -537,7 +589,7 @@ class BFVCrt:
     def Decrypt(
         self,
         s: Polynomial,
-        ciphertexts: list[tuple[Polynomial, Polynomial]],
+        ciphertexts: list[Ciphertext],
     ) -> Polynomial:
         """
         Decrypts a set of ciphertexts in their CRT representation given a secret key.
@@ -553,9 +605,11 @@ class BFVCrt:
         matrix = []
 
         for i in range(len(self.crt_moduli.qis)):
-            inner_product = ciphertexts[i][0] + ciphertexts[i][1] * s
-            inner_product.reduce_in_ring(self.bfv_qis[i].rlwe.Rq)
-            matrix.append(inner_product.coefficients)
+            rqi = self.bfv_qis[i].rlwe.Rq
+            # ct0 + ct1 * s in Rqi
+            inner_product = ciphertexts[i][0] + Polynomial(ciphertexts[i][1].coefficients, rqi) * s
+            inner_product.reduce_in_ring(rqi)
+            matrix.append(inner_product.coefficients.tolist())
 
         # assert that the matrix has k rows and n columns
         assert len(matrix) == len(self.crt_moduli.qis)
@@ -564,22 +618,26 @@ class BFVCrt:
         assert all(len(row) == len(matrix[0]) for row in matrix)
         assert len(matrix[0]) == self.bfv_q.rlwe.n
 
+        # the scaling factor t * qi_tilde / qi of each row of the matrix doesn't depend on the coefficient
+        scaling_factors = []
+        for j in range(len(self.crt_moduli.qis)):
+            qi_star = 1
+            for k in range(len(self.crt_moduli.qis)):
+                if k != j:
+                    qi_star *= self.crt_moduli.qis[k]
+            qi_tilde = pow(
+                qi_star, -1, self.crt_moduli.qis[j]
+            )
+            scaling_factor = qi_tilde * self.bfv_q.rlwe.Rt.modulus
+            scaling_factors.append(Decimal(scaling_factor) / Decimal(self.crt_moduli.qis[j]))
+
         # recover each coefficient of m from the matrix. Procedure based on paragraph 2.3 of https://eprint.iacr.org/2018/117
         message = []
         for i in range(self.bfv_q.rlwe.n):
             message_coeff = 0
             for j in range(len(self.crt_moduli.qis)):
                 x_i = matrix[j][i]
-                qi_star = 1
-                for k in range(len(self.crt_moduli.qis)):
-                    if k != j:
-                        qi_star *= self.crt_moduli.qis[k]
-                qi_tilde = pow(
-                    qi_star, -1, self.crt_moduli.qis[j]
-                )
-                scaling_factor = qi_tilde * self.bfv_q.rlwe.Rt.modulus
-                scaling_factor = Decimal(scaling_factor) / Decimal(self.crt_moduli.qis[j])
-                message_coeff += x_i * scaling_factor
+                message_coeff += x_i * scaling_factors[j]
 
             # round the coefficient to the nearest integer
             message_coeff = round(message_coeff)
@@ -591,10 +649,34 @@ class BFVCrt:
 
         return Polynomial(message)
 
+    def EvalAdd(
+        self,
+        ciphertexts1: list[Ciphertext],
+        ciphertexts2: list[Ciphertext],
+    ) -> list[Ciphertext]:
+        """
+        Add two ciphertexts in their CRT representation. The addition is performed independently in each Rqi.
+
+        Parameters:
+        - ciphertexts1: First ciphertexts expressed in their CRT representation.
+        - ciphertexts2: Second ciphertexts expressed in their CRT representation.
+
+        Returns:
+        ciphertexts_sum: Sum of the two ciphertexts in their CRT representation.
+        """
+        ciphertexts_sum = []
+
+        for i in range(len(self.crt_moduli.qis)):
+            ciphertexts_sum.append(
+                self.bfv_qis[i].EvalAdd(ciphertexts1[i], ciphertexts2[i])
+            )
+
+        return ciphertexts_sum
+
     def DecryptDummy(
         self,
         s: Polynomial,
-        ciphertexts: list[tuple[Polynomial, Polynomial]],
+        ciphertexts: list[Ciphertext],
     ) -> Polynomial:
         """
         Decrypts a set of ciphertexts in their CRT representation given a secret key.
@@ -128,11 +128,13 @@ class CRTPolynomial:
         Returns: polynomial in R_q
         """
         assert len(rqi_polynomials) == len(crt_moduli.qis)
+        # recover the coefficients over Python integers as they can exceed 64 bits
+        rqi_coefficients = [rqi_polynomial.coefficients.tolist() for rqi_polynomial in rqi_polynomials]
         rq_coefficients = []
-        for i in range(len(rqi_polynomials[0].coefficients)):
+        for i in range(len(rqi_coefficients[0])):
             coeff_crt_components = []
-            for j in range(len(rqi_polynomials)):
-                coeff_crt_components.append(rqi_polynomials[j].coefficients[i])
+            for j in range(len(rqi_coefficients)):
+                coeff_crt_components.append(rqi_coefficients[j][i])
             coeff_crt_integer = CRTInteger(crt_moduli, coeff_crt_components)
             coeff = coeff_crt_integer.recover_with_centered_remainder()
             rq_coefficients.append(coeff)
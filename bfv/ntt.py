@@ -1,7 +1,18 @@
-from typing import List
+import functools
+from dataclasses import dataclass
+from typing import List, Optional
 import galois
+import numpy as np
+from numba import njit, prange
 
-from bfv.polynomial import Polynomial, get_centered_remainder
+from bfv.utils import get_centered_remainder, get_standard_form
+from bfv.primality import is_probable_prime
+
+try:
+    # optional C implementation of the compiled NTT, built by `python setup.py build_ext --inplace`
+    from bfv import _ntt
+except ImportError:
+    _ntt = None
 
 def ntt_poly_mul(coeffs1: List[int], coeffs2: List[int], size: int, p: int) -> List[int]:
     """
@@ -13,7 +24,7 @@ def ntt_poly_mul(coeffs1: List[int], coeffs2: List[int], size: int, p: int) -> L
     ntt_evals_2 = galois.ntt(coeffs2, size, p)
     ntt_product = [ntt_evals_1[i] * ntt_evals_2[i] for i in range(size)]
     product = galois.intt(ntt_product, size, p)
-    
+
     # trim the product to the correct length
     product = product[:len(coeffs1) + len(coeffs2) - 1]
 
@@ -26,10 +37,382 @@ def ntt_poly_mul_centered_remainder(coeffs_1_centered: List[int], coeffs_2_cente
     Polynomial coefficients are defined with their centered remainder modulo p representation
     """
 
-    coeffs_1_standard = Polynomial(coeffs_1_centered).into_standard_form(p)
-    coeffs_2_standard = Polynomial(coeffs_2_centered).into_standard_form(p)
+    coeffs_1_standard = [get_standard_form(coeff, p) for coeff in coeffs_1_centered]
+    coeffs_2_standard = [get_standard_form(coeff, p) for coeff in coeffs_2_centered]
 
-    product_standard = ntt_poly_mul(coeffs_1_standard.coefficients, coeffs_2_standard.coefficients, size, p)
+    product_standard = ntt_poly_mul(coeffs_1_standard, coeffs_2_standard, size, p)
     product_centered = [get_centered_remainder(int(coeff), p) for coeff in product_standard]
 
-    return product_centered
\ No newline at end of file
+    return product_centered
+
+def bit_reverse(x: int, bits: int) -> int:
+    """
+    Reverse the order of the lowest `bits` bits of x.
+    """
+    result = 0
+    for _ in range(bits):
+        result = (result << 1) | (x & 1)
+        x >>= 1
+    return result
+
+def find_primitive_2nth_root_of_unity(n: int, q: int) -> int:
+    """
+    Find ψ, a primitive 2n-th root of unity modulo the prime q. Requires q = 1 mod 2n.
+    """
+    assert (q - 1) % (2 * n) == 0, "q must be congruent to 1 mod 2n"
+
+    exponent = (q - 1) // (2 * n)
+    for g in range(2, q):
+        psi = pow(g, exponent, q)
+        # ψ^(2n) = 1 by construction. Since 2n is a power of 2, ψ^n = -1 guarantees that the order of ψ is exactly 2n
+        if pow(psi, n, q) == q - 1:
+            return psi
+
+    raise ValueError("No primitive 2n-th root of unity found, q must be a prime")
+
+# Moduli up to this bit size use the compiled NTT. Harvey's butterfly keeps values lazily reduced in [0, 4q), which must fit in 64 bits
+COMPILED_NTT_MAX_BITS = 62
+
+# Moduli up to this bit size run the AVX-512 IFMA NTT of the C extension on CPUs supporting it: the lazily reduced values in [0, 4q) fit in 52 bits
+IFMA_NTT_MAX_BITS = 50
+
+def find_ntt_primes(n: int, bits: int, count: int) -> List[int]:
+    """
+    Find the count largest primes smaller than 2^bits and congruent to 1 mod 2n, in decreasing order.
+    These primes support the negacyclic NTT of size n, e.g. CRT moduli of `IFMA_NTT_MAX_BITS` bits run the AVX-512 IFMA NTT.
+    """
+    primes = []
+    # largest q = 1 mod 2n smaller than 2^bits
+    q = (2**bits - 2) // (2 * n) * (2 * n) + 1
+    while len(primes) < count:
+        if q <= 2 * n:
+            raise ValueError("Not enough primes congruent to 1 mod 2n below 2^bits")
+        if is_probable_prime(q):
+            primes.append(q)
+        q -= 2 * n
+    return primes
+
+def ntt_dtype(q: int):
+    """
+    Return the dtype of the arrays holding NTT values modulo q, which are lazily reduced in [0, 4q).
+    """
+    return np.uint64 if 4 * q < 2**64 else object
+
+def shoup_precomputation(w: np.ndarray, q: int) -> np.ndarray:
+    """
+    Precompute the Shoup multipliers w' = floor(w * 2^64 / q) of the constants w in [0, q).
+    w * y mod q is then computed as w * y - floor(w' * y / 2^64) * q, which lies in [0, 2q), without any division.
+    """
+    return np.array([(int(wi) << 64) // q for wi in w], dtype=np.uint64)
+
+def barrett_precomputation(q: int) -> int:
+    """
+    Precompute the Barrett multiplier mu = floor(2^(2L) / q) of the L-bit modulus q.
+    For x < q^2, x mod q is then computed as x - floor(floor(x / 2^(L-1)) * mu / 2^(L+1)) * q, which lies in [0, 3q), without any division.
+    """
+    return (1 << (2 * q.bit_length())) // q
+
+@dataclass(frozen=True)
+class NTTTables:
+    """
+    Precomputed tables of the negacyclic NTT of size n modulo q, as computed by `negacyclic_ntt_tables`.
+    - psi_pows: the powers ψ^i stored in bit-reversed order, in the order the butterflies consume them
+    - psi_pre: the Shoup multipliers of psi_pows
+    - inv_psi_pows: the powers ψ^-i stored in bit-reversed order
+    - inv_psi_pre: the Shoup multipliers of inv_psi_pows
+    - n_inv: n^-1 mod q
+    - n_inv_pre: the Shoup multiplier of n_inv
+
+    The Shoup multipliers are only computed (otherwise None) for moduli supported by the compiled NTT, see `COMPILED_NTT_MAX_BITS`.
+    The tables are shared by every ring with the same (n, q), their arrays are read-only.
+    """
+    psi_pows: np.ndarray
+    psi_pre: Optional[np.ndarray]
+    inv_psi_pows: np.ndarray
+    inv_psi_pre: Optional[np.ndarray]
+    n_inv: int
+    n_inv_pre: Optional[int]
+
+@functools.lru_cache(maxsize=None)
+def negacyclic_ntt_tables(n: int, q: int) -> Optional[NTTTables]:
+    """
+    Precompute the tables for the negacyclic NTT of size n modulo q. The tables are computed once per (n, q).
+    Returns None if the negacyclic NTT is not defined for (n, q), namely if q is not a prime congruent to 1 mod 2n.
+    """
+    if (q - 1) % (2 * n) != 0 or not is_probable_prime(q):
+        return None
+
+    log_n = n.bit_length() - 1
+    psi = find_primitive_2nth_root_of_unity(n, q)
+    inv_psi = pow(psi, -1, q)
+    psi_pows = np.array([pow(psi, bit_reverse(i, log_n), q) for i in range(n)], dtype=ntt_dtype(q))
+    inv_psi_pows = np.array([pow(inv_psi, bit_reverse(i, log_n), q) for i in range(n)], dtype=ntt_dtype(q))
+    n_inv = pow(n, -1, q)
+
+    psi_pre = inv_psi_pre = n_inv_pre = None
+    if q.bit_length() <= COMPILED_NTT_MAX_BITS:
+        psi_pre = shoup_precomputation(psi_pows, q)
+        inv_psi_pre = shoup_precomputation(inv_psi_pows, q)
+        n_inv_pre = (n_inv << 64) // q
+
+    for table in (psi_pows, psi_pre, inv_psi_pows, inv_psi_pre):
+        if table is not None:
+            table.flags.writeable = False
+
+    return NTTTables(psi_pows, psi_pre, inv_psi_pows, inv_psi_pre, n_inv, n_inv_pre)
+
+def ntt_forward(a: np.ndarray, q: int, psis: np.ndarray, psis_pre: Optional[np.ndarray]) -> np.ndarray:
+    """
+    In-place negacyclic NTT of the coefficients a (lowest degree first) modulo q.
+    Cooley-Tukey iteration using Harvey's butterfly (X, Y) -> (X + WY, X - WY): values are kept lazily in [0, 4q) and only fully reduced to [0, q) at the end.
+    - a: coefficients in [0, 4q) with dtype `ntt_dtype(q)`, its length n must be a power of 2.
+    - psis: the powers of ψ in bit-reversed order, see `NTTTables`.
+    - psis_pre: the Shoup multipliers of psis, see `NTTTables`.
+
+    Returns a, which now holds the NTT evaluations in bit-reversed order: a[i] is the evaluation at ψ^(2*bit_reverse(i)+1).
+    Neither transform performs a permutation pass. The stage with m butterfly groups reads the twiddles psis[m:2m] sequentially, and `ntt_inverse` consumes the bit-reversed order as is.
+
+    The compiled NTT runs the C extension `bfv._ntt` when it is built (with AVX-512 IFMA for moduli of up to `IFMA_NTT_MAX_BITS` bits), otherwise the Numba kernel `_ntt_ct`.
+    """
+    if q.bit_length() <= COMPILED_NTT_MAX_BITS:
+        if _ntt is not None:
+            _ntt.ntt_ct_harvey(a, psis, psis_pre, q)
+        else:
+            _ntt_ct(a, psis, psis_pre, np.uint64(q))
+    else:
+        a[:] = _ntt_ct_python(a.tolist(), q, psis.tolist())
+
+    return a
+
+def ntt_inverse(A: np.ndarray, q: int, inv_psis: np.ndarray, inv_psis_pre: Optional[np.ndarray], n_inv: int, n_inv_pre: Optional[int]) -> np.ndarray:
+    """
+    In-place inverse negacyclic NTT of the evaluations A modulo q.
+    Gentleman-Sande iteration using Harvey's butterfly (X, Y) -> (X + Y, W(X - Y)): values are kept lazily in [0, 2q) and only fully reduced to [0, q) at the end.
+    - A: NTT evaluations in [0, 2q) in bit-reversed order, as returned by `ntt_forward`, with dtype `ntt_dtype(q)`.
+    - inv_psis: the powers of ψ^-1 in bit-reversed order, see `NTTTables`.
+    - inv_psis_pre: the Shoup multipliers of inv_psis, see `NTTTables`.
+    - n_inv: n^-1 mod q.
+    - n_inv_pre: the Shoup multiplier of n_inv, see `NTTTables`.
+
+    Returns A, which now holds the coefficients (lowest degree first) in [0, q).
+
+    The compiled NTT runs the C extension `bfv._ntt` when it is built (with AVX-512 IFMA for moduli of up to `IFMA_NTT_MAX_BITS` bits), otherwise the Numba kernel `_intt_gs`.
+    """
+    if q.bit_length() <= COMPILED_NTT_MAX_BITS:
+        if _ntt is not None:
+            _ntt.intt_gs_harvey(A, inv_psis, inv_psis_pre, q, n_inv, n_inv_pre)
+        else:
+            _intt_gs(A, inv_psis, inv_psis_pre, np.uint64(q), np.uint64(n_inv), np.uint64(n_inv_pre))
+    else:
+        A[:] = _intt_gs_python(A.tolist(), q, inv_psis.tolist(), n_inv)
+
+    return A
+
+def ntt_pointwise_mul(A: np.ndarray, B: np.ndarray, q: int) -> np.ndarray:
+    """
+    Multiply two vectors of NTT evaluations in [0, q) modulo q.
+    """
+    # the product of two values in [0, q) fits in 64 bits
+    if q.bit_length() <= 32:
+        return (A * B) % np.uint64(q)
+
+    # the 128-bit product is reduced with Barrett's method in machine words
+    if q.bit_length() <= COMPILED_NTT_MAX_BITS:
+        out = np.empty_like(A)
+        mu = barrett_precomputation(q)
+        if _ntt is not None:
+            _ntt.pointwise_mul_barrett(A, B, out, q, mu)
+        else:
+            _pointwise_mul_barrett(A, B, out, np.uint64(q), np.uint64(mu), np.uint64(q.bit_length()))
+        return out
+
+    product = (A.astype(object) * B.astype(object)) % q
+    return product.astype(ntt_dtype(q))
+
+def ntt_pointwise_add(A: np.ndarray, B: np.ndarray, q: int) -> np.ndarray:
+    """
+    Add two vectors of NTT evaluations in [0, q) modulo q.
+    """
+    # the sum of two values in [0, q) is smaller than 2q, a conditional subtraction of q brings it back to [0, q)
+    total = A + B
+    return np.where(total >= q, total - q, total).astype(A.dtype)
+
+def ntt_pointwise_sub(A: np.ndarray, B: np.ndarray, q: int) -> np.ndarray:
+    """
+    Subtract two vectors of NTT evaluations in [0, q) modulo q.
+    """
+    # A + (q - B) is in [0, 2q) and doesn't underflow for unsigned evaluations
+    difference = A + (q - B)
+    return np.where(difference >= q, difference - q, difference).astype(A.dtype)
+
+@njit(inline="always")
+def _mulhi(a, b):
+    """
+    High 64 bits of the 128-bit product of a and b, computed from their 32-bit halves.
+    """
+    mask = np.uint64(0xFFFFFFFF)
+    shift = np.uint64(32)
+    a_lo = a & mask
+    a_hi = a >> shift
+    b_lo = b & mask
+    b_hi = b >> shift
+
+    lo_lo = a_lo * b_lo
+    hi_lo = a_hi * b_lo
+    lo_hi = a_lo * b_hi
+    hi_hi = a_hi * b_hi
+
+    cross = (lo_lo >> shift) + (hi_lo & mask) + lo_hi
+    return hi_hi + (hi_lo >> shift) + (cross >> shift)
+
+@njit(inline="always")
+def _mulmod_shoup(w, w_pre, y, q):
+    """
+    w * y mod q, lazily reduced in [0, 2q), for a constant w with Shoup multiplier w_pre. Multiplications wrap around modulo 2^64.
+    """
+    return w * y - _mulhi(w_pre, y) * q
+
+@njit(cache=True, parallel=True)
+def _pointwise_mul_barrett(A, B, out, q, mu, bits):
+    """
+    out = A * B mod q for A, B in [0, q) and a modulus q of 33 to 62 bits with Barrett multiplier mu, see `barrett_precomputation`.
+    """
+    for j in prange(A.shape[0]):
+        a = A[j]
+        b = B[j]
+        # 128-bit product x = hi * 2^64 + lo
+        lo = a * b
+        hi = _mulhi(a, b)
+        # q1 = floor(x / 2^(L-1)) fits in L + 1 bits
+        q1 = (hi << (np.uint64(65) - bits)) | (lo >> (bits - np.uint64(1)))
+        # q3 = floor(q1 * mu / 2^(L+1)) underestimates floor(x / q) by at most 2
+        q2_lo = q1 * mu
+        q2_hi = _mulhi(q1, mu)
+        q3 = (q2_hi << (np.uint64(63) - bits)) | (q2_lo >> (bits + np.uint64(1)))
+        # x - q3 * q is in [0, 3q), its computation modulo 2^64 is exact
+        r = lo - q3 * q
+        r = min(r, r - q)
+        out[j] = min(r, r - q)
+
+@njit(cache=True, parallel=True)
+def _ntt_ct(a, psis, psis_pre, q):
+    n = a.shape[0]
+    two_q = q + q
+
+    t = n
+    m = 1
+    while m < n:
+        t >>= 1
+        # the m groups of butterflies of a stage are independent
+        for i in prange(m):
+            j1 = 2 * i * t
+            w = psis[m + i]
+            w_pre = psis_pre[m + i]
+            for j in range(j1, j1 + t):
+                x = a[j]
+                # branchless conditional subtraction: if x < 2q, x - 2q wraps around to a larger value
+                x = min(x, x - two_q)
+                y = _mulmod_shoup(w, w_pre, a[j + t], q)
+                a[j] = x + y
+                # x - y wraps around modulo 2^64, adding 2q brings it back to [0, 4q)
+                a[j + t] = x - y + two_q
+        m <<= 1
+
+    # single final reduction from [0, 4q) to [0, q)
+    for j in prange(n):
+        x = a[j]
+        x = min(x, x - two_q)
+        a[j] = min(x, x - q)
+
+@njit(cache=True, parallel=True)
+def _intt_gs(A, inv_psis, inv_psis_pre, q, n_inv, n_inv_pre):
+    n = A.shape[0]
+    two_q = q + q
+
+    t = 1
+    m = n
+    while m > 1:
+        h = m >> 1
+        # the h groups of butterflies of a stage are independent
+        for i in prange(h):
+            j1 = 2 * i * t
+            w = inv_psis[h + i]
+            w_pre = inv_psis_pre[h + i]
+            for j in range(j1, j1 + t):
+                x = A[j]
+                y = A[j + t]
+                s = x + y
+                A[j] = min(s, s - two_q)
+                A[j + t] = _mulmod_shoup(w, w_pre, x - y + two_q, q)
+        t <<= 1
+        m = h
+
+    # scale by n^-1 and bring the values from [0, 2q) to [0, q)
+    for j in prange(n):
+        x = _mulmod_shoup(n_inv, n_inv_pre, A[j], q)
+        A[j] = min(x, x - q)
+
+def _ntt_ct_python(a: List[int], q: int, psis: List[int]) -> List[int]:
+    """
+    Python fallback of `ntt_forward` for moduli too large for the compiled NTT.
+    """
+    n = len(a)
+    two_q = 2 * q
+
+    t = n
+    m = 1
+    while m < n:
+        t >>= 1
+        for i in range(m):
+            j1 = 2 * i * t
+            w = psis[m + i]
+            for j in range(j1, j1 + t):
+                x = a[j]
+                if x >= two_q:
+                    x -= two_q
+                y = (w * a[j + t]) % q
+                a[j] = x + y
+                a[j + t] = x - y + two_q
+        m <<= 1
+
+    # bring the values from [0, 4q) to [0, q)
+    for j in range(n):
+        x = a[j]
+        if x >= two_q:
+            x -= two_q
+        if x >= q:
+            x -= q
+        a[j] = x
+
+    return a
+
+def _intt_gs_python(A: List[int], q: int, inv_psis: List[int], n_inv: int) -> List[int]:
+    """
+    Python fallback of `ntt_inverse` for moduli too large for the compiled NTT.
+    """
+    n = len(A)
+    two_q = 2 * q
+
+    t = 1
+    m = n
+    while m > 1:
+        h = m >> 1
+        j1 = 0
+        for i in range(h):
+            w = inv_psis[h + i]
+            for j in range(j1, j1 + t):
+                x = A[j]
+                y = A[j + t]
+                s = x + y
+                if s >= two_q:
+                    s -= two_q
+                A[j] = s
+                A[j + t] = (w * (x - y + two_q)) % q
+            j1 += 2 * t
+        t <<= 1
+        m = h
+
+    for j in range(n):
+        A[j] = (A[j] * n_inv) % q
+
+    return A
@@ -1,4 +1,8 @@
 import random
+from typing import Optional, Union
+import numpy as np
+from .utils import get_centered_remainder, get_centered_remainder_fp, get_standard_form
+from .ntt import negacyclic_ntt_tables, ntt_dtype, ntt_forward, ntt_inverse, ntt_pointwise_add, ntt_pointwise_mul, ntt_pointwise_sub
 
 class PolynomialRing:
     def __init__(self, n: int, modulus: int) -> None:
@@ -6,6 +10,8 @@ class PolynomialRing:
         Initialize a polynomial ring R_modulus = Z_modulus[x]/f(x) where f(x)=x^n+1.
         - modulus is a prime number.
         - n is a power of 2.
+
+        If the modulus is a prime congruent to 1 mod 2n, the tables of the negacyclic NTT are precomputed so that polynomials in the ring can be multiplied via NTT.
         """
 
         assert n > 0 and (n & (n - 1)) == 0, "n must be a power of 2"
@@ -15,23 +21,30 @@ class PolynomialRing:
         self.denominator = fx
         self.modulus = modulus
         self.n = n
+        self.ntt_tables = negacyclic_ntt_tables(n, modulus)
 
     def sample_polynomial(self) -> "Polynomial":
         """
         Sample polynomial from the ring
         """
 
-        # range for random.randint
-        lower_bound = - (self.modulus - 1) / 2 # inclusive
-        upper_bound = (self.modulus - 1) / 2 # inclusive
+        # range of the coefficients [-bound, bound], both ends inclusive
+        assert self.modulus % 2 == 1, "modulus must be odd"
+        bound = (self.modulus - 1) // 2
 
-        # assert that the bounds float are integers namely the decimal part is 0
-        assert lower_bound % 1 == 0 and upper_bound % 1 == 0
-    
-        # generate n random coefficients in the range [lower_bound, upper_bound]
-        coeffs = [random.randint(int(lower_bound), int(upper_bound)) for _ in range(self.n)]
+        # generate n random coefficients in the range [-bound, bound]
+        if self.modulus < INT64_COEFFICIENT_BOUND:
+            coeffs = _aligned_zeros(self.n, np.int64)
+            coeffs[:] = np.random.default_rng().integers(-bound, bound + 1, size=self.n, dtype=np.int64)
+        else:
+            # the coefficients don't fit in int64, sample them as Python integers
+            coeffs = _aligned_zeros(self.n, object)
+            coeffs[:] = [random.randint(-bound, bound) for _ in range(self.n)]
 
-        return Polynomial(coeffs)
+        poly = Polynomial(coeffs, self)
+        # the sampled coefficients are already reduced in the ring
+        poly._reduced = True
+        return poly
 
     def __eq__(self, other) -> bool:
         if isinstance(other, PolynomialRing):
@@ -42,87 +55,307 @@ class PolynomialRing:
 
 
 class Polynomial:
-    def __init__(self, coefficients: list[int]):
+    def __init__(self, coefficients: Union[list[int], np.ndarray], ring: Optional[PolynomialRing] = None):
         """
         Initialize a polynomial with the given coefficients starting from the highest degree coefficient.
+        The coefficients are stored as a NumPy array, see `into_coefficient_array`.
+        - ring: optional polynomial ring the polynomial lives in. Multiplications of polynomials living in a ring are performed in that ring.
+
+        The NTT evaluations of the polynomial are cached in `_ntt` (together with the ring `_ntt_ring` they were computed in) the first time they are needed, see `to_ntt`.
+        The flag `_reduced` records whether the coefficients are known to be reduced in the ring, in which case `reduce_in_ring` is a no-op.
+        Operations don't reduce their result, the reduction is deferred until `reduce_in_ring` is called.
         """
         self.coefficients = coefficients
+        self.ring = ring
+
+    @property
+    def coefficients(self) -> np.ndarray:
+        # polynomials built by `from_ntt` only recover their coefficients when they are accessed
+        if self._coefficients is None:
+            self._coefficients = ntt_to_poly(self._ntt, self._ntt_ring)
+        return self._coefficients
+
+    @coefficients.setter
+    def coefficients(self, coefficients: Union[list[int], np.ndarray]) -> None:
+        self._coefficients = into_coefficient_array(coefficients)
+        # the cached NTT evaluations belong to the previous coefficients
+        self._ntt: Optional[np.ndarray] = None
+        self._ntt_ring: Optional[PolynomialRing] = None
+        self._reduced = False
+
+    def has_ntt(self, ring: PolynomialRing) -> bool:
+        """
+        Check if the NTT evaluations of the polynomial in the ring are cached.
+        """
+        return self._ntt is not None and (self._ntt_ring is ring or self._ntt_ring == ring)
+
+    def to_ntt(self, ring: PolynomialRing) -> np.ndarray:
+        """
+        Return the NTT evaluations of the polynomial in the ring, see `poly_to_ntt`.
+        The evaluations are computed once and cached, the returned array must not be modified.
+        """
+        if not self.has_ntt(ring):
+            ntt_evals = poly_to_ntt(self.coefficients, ring)
+            self._ntt = ntt_evals
+            self._ntt_ring = ring
+        return self._ntt
+
+    @staticmethod
+    def from_ntt(ntt_evals: np.ndarray, ring: PolynomialRing) -> "Polynomial":
+        """
+        Build the polynomial of the ring whose NTT evaluations are ntt_evals.
+        The inverse NTT is only performed when the coefficients of the polynomial are accessed.
+        """
+        poly = Polynomial([], ring)
+        poly._coefficients = None
+        poly._ntt = ntt_evals
+        poly._ntt_ring = ring
+        # the coefficients recovered from the NTT evaluations are reduced in the ring
+        poly._reduced = True
+        return poly
 
     def reduce_coefficients_by_modulus(self, modulus: int) -> None:
         """
         Reduce the coefficients of the polynomial by the modulus of the polynomial ring.
         """
-        for i in range(len(self.coefficients)):
-            self.coefficients[i] = get_centered_remainder(self.coefficients[i], modulus)
+        self.coefficients = get_centered_remainder(self.coefficients, modulus)
 
     def reduce_coefficients_by_cyclo(self, cyclo: list[int]) -> None:
         """
         Reduce the coefficients by dividing it by the cyclotomic polynomial and returning the remainder.
         The cyclotomic polynomial is x^n+1.
         """
-        _, remainder = poly_div(self.coefficients, cyclo)
-
         n = len(cyclo) - 1
 
-        # pad the remainder with zeroes to make it len=n
-        remainder = [0] * (n - len(remainder)) + remainder
-
-        assert len(remainder) == n
-
-        self.coefficients = remainder
+        self.coefficients = reduce_by_negacyclic(self.coefficients, n)
 
     def reduce_in_ring(self, ring: PolynomialRing) -> None:
         """
         Reduce the coefficients of the polynomial by the modulus of the polynomial ring and by the denominator of the polynomial ring.
         """
+        if self._reduced and (self.ring is ring or self.ring == ring):
+            return
+
+        ntt_evals, ntt_ring = self._ntt, self._ntt_ring
         self.reduce_coefficients_by_cyclo(ring.denominator)
         self.reduce_coefficients_by_modulus(ring.modulus)
+        self.ring = ring
+
+        # the reduction doesn't change the polynomial as an element of the ring, its NTT evaluations remain valid
+        if ntt_evals is not None and (ntt_ring is ring or ntt_ring == ring):
+            self._ntt, self._ntt_ring = ntt_evals, ntt_ring
+
+        self._reduced = True
+
+    def common_ring(self, other) -> Optional[PolynomialRing]:
+        """
+        Return the ring in which an operation between the two polynomials takes place.
+        A polynomial which doesn't live in any ring (e.g. a secret key or an error polynomial) is interpreted in the ring of the other operand.
+        Returns None if neither polynomial lives in a ring or if they live in different rings.
+        """
+        if self.ring is None:
+            return other.ring
+        if other.ring is None or other.ring == self.ring:
+            return self.ring
+        return None
 
     def __add__(self, other) -> "Polynomial":
-        return Polynomial(poly_add(self.coefficients, other.coefficients))
+        """
+        Add two polynomials.
+        If the NTT evaluations of both polynomials in their ring are cached, the sum is computed on the evaluations, without any transform.
+        """
+        ring = self.common_ring(other)
+
+        if ring is not None and self.has_ntt(ring) and other.has_ntt(ring):
+            return Polynomial.from_ntt(ntt_pointwise_add(self._ntt, other._ntt, ring.modulus), ring)
+
+        return Polynomial(poly_add(self.coefficients, other.coefficients), ring)
     
     def __sub__(self, other) -> "Polynomial":
-        return Polynomial(poly_sub(self.coefficients, other.coefficients))
+        """
+        Subtract two polynomials.
+        If the NTT evaluations of both polynomials in their ring are cached, the difference is computed on the evaluations, without any transform.
+        """
+        ring = self.common_ring(other)
+
+        if ring is not None and self.has_ntt(ring) and other.has_ntt(ring):
+            return Polynomial.from_ntt(ntt_pointwise_sub(self._ntt, other._ntt, ring.modulus), ring)
+
+        return Polynomial(poly_sub(self.coefficients, other.coefficients), ring)
+
+    def __neg__(self) -> "Polynomial":
+        """
+        Negate the polynomial. If its NTT evaluations are cached, the evaluations of the negation are derived from them without any transform.
+        """
+        if self._ntt is not None:
+            ntt_negation = ntt_pointwise_sub(np.zeros_like(self._ntt), self._ntt, self._ntt_ring.modulus)
+            if self._coefficients is None:
+                return Polynomial.from_ntt(ntt_negation, self._ntt_ring)
+
+        negation = Polynomial(np.negative(self.coefficients), self.ring)
+
+        if self._ntt is not None:
+            negation._ntt, negation._ntt_ring = ntt_negation, self._ntt_ring
+        # centered coefficients modulo an odd modulus remain centered
+        negation._reduced = self._reduced and self.ring.modulus % 2 == 1
+
+        return negation
 
     def __mul__(self, other) -> "Polynomial":
-        return Polynomial(poly_mul_naive(self.coefficients, other.coefficients))
+        """
+        Multiply two polynomials.
+        If the polynomials live in a ring, the product is reduced in that ring. When the modulus of the ring is NTT friendly, the product is computed via negacyclic NTT:
+        the NTT evaluations of the operands are cached and the coefficients of the product are only recovered when they are accessed.
+        Otherwise the product is computed naively.
+        """
+        ring = self.common_ring(other)
+
+        if ring is None:
+            return Polynomial(poly_mul(self.coefficients, other.coefficients))
+
+        if ring.ntt_tables is None:
+            if poly_mul_fft_in_ring_is_exact(self.coefficients, other.coefficients, ring):
+                product = Polynomial(poly_mul_fft_in_ring(self.coefficients, other.coefficients, ring), ring)
+                product._reduced = True
+                return product
+
+            product = Polynomial(poly_mul(self.coefficients, other.coefficients))
+            product.reduce_in_ring(ring)
+            return product
+
+        ntt_product = ntt_pointwise_mul(self.to_ntt(ring), other.to_ntt(ring), ring.modulus)
+        return Polynomial.from_ntt(ntt_product, ring)
     
     def evaluate(self, x: int) -> int:
         """
         Evaluate the polynomial at x.
         """
-        result = 0
-        for coeff in self.coefficients:
-            result = result * x + coeff
-        return result
+        # evaluate over Python integers as the result can be arbitrarily large
+        return np.polyval(self.coefficients.astype(object), np.asarray(x, dtype=object))
     
     def __eq__(self, other) -> bool:
         if isinstance(other, Polynomial):
-            return self.coefficients == other.coefficients
+            return np.array_equal(self.coefficients, other.coefficients)
         return False
         
     def scalar_mul(self, scalar: int) -> "Polynomial":
         """
         Multiply the polynomial by a scalar.
         """
-        return Polynomial([scalar * coeff for coeff in self.coefficients])
+        return Polynomial(self.coefficients.astype(object) * scalar)
     
     def into_centered_coefficients(self, modulus: int) -> "Polynomial":
         """
         Turn the coefficients of the polynomial into centered coefficients with respect to the modulus, namely in the range [-(modulus-1)/2, (modulus+1)/2].
         """
-        centered_coeffs = [get_centered_remainder(coeff, modulus) for coeff in self.coefficients]
-        return Polynomial(centered_coeffs)
+        return Polynomial(get_centered_remainder(self.coefficients, modulus))
     
     def into_standard_form(self, modulus: int) -> "Polynomial":
         """
         Turn the coefficients of the polynomial into standard form with respect to the modulus, namely in the range [0, modulus-1].
         """
-        standard_coeffs = [get_standard_form(coeff, modulus) for coeff in self.coefficients]
-        return Polynomial(standard_coeffs)
+        return Polynomial(get_standard_form(self.coefficients, modulus))
+
+
+# Bound on the absolute value of the coefficients stored as int64. It leaves one bit of headroom so that adding or subtracting two coefficients cannot overflow.
+INT64_COEFFICIENT_BOUND = 2**62
+
+def into_coefficient_array(coefficients: Union[list[int], np.ndarray]) -> np.ndarray:
+    """
+    Turn the coefficients into a NumPy array.
+    The array has dtype int64 if every coefficient lies in (-2^62, 2^62), otherwise it has object dtype, namely it holds Python integers of arbitrary size.
+    Floating point coefficients must be integer valued.
+    """
+    coefficients = np.asarray(coefficients)
+
+    if coefficients.dtype.kind == "f":
+        assert np.all(np.isfinite(coefficients)) and np.all(coefficients == np.floor(coefficients)), "coefficients must be integer valued"
+        # floats outside the int64 range are converted exactly through Python integers
+        if coefficients.size == 0 or np.abs(coefficients).max() < INT64_COEFFICIENT_BOUND:
+            coefficients = coefficients.astype(np.int64)
+        else:
+            coefficients = np.frompyfunc(int, 1, 1)(coefficients).astype(object)
+    elif coefficients.dtype.kind == "i":
+        coefficients = coefficients.astype(np.int64, copy=False)
+    elif coefficients.dtype.kind == "u" and (coefficients.size == 0 or coefficients.max() < INT64_COEFFICIENT_BOUND):
+        coefficients = coefficients.astype(np.int64)
+    elif coefficients.dtype != object:
+        coefficients = coefficients.astype(object)
+
+    if coefficients.size == 0:
+        return coefficients.astype(np.int64, copy=False)
+
+    fits_int64 = -INT64_COEFFICIENT_BOUND < coefficients.min() and coefficients.max() < INT64_COEFFICIENT_BOUND
+
+    if coefficients.dtype == np.int64:
+        return coefficients if fits_int64 else coefficients.astype(object)
+
+    return coefficients.astype(np.int64) if fits_int64 else coefficients
+
+def pad_coefficients(coefficients: np.ndarray, length: int) -> np.ndarray:
+    """
+    Pad the coefficients with zeros at the beginning (namely at the highest degrees) to make them len=length.
+    """
+    padding = np.zeros(length - len(coefficients), dtype=coefficients.dtype)
+    return np.concatenate((padding, coefficients))
+
+# Alignment in bytes of the coefficient buffers allocated by `_aligned_zeros`: the size of a 512-bit vector register, which is also the size of a cache line.
+COEFFICIENT_BUFFER_ALIGNMENT = 64
+
+def _aligned_zeros(n: int, dtype=np.int64, align: int = COEFFICIENT_BUFFER_ALIGNMENT) -> np.ndarray:
+    """
+    Allocate an array of n zeros whose data starts on an align-byte boundary, so that vectorized loops over the array never load a vector split across two cache lines.
+    The polynomials sampled from a ring and the input buffers of the NTT are allocated this way. Arrays derived from them by NumPy operations don't keep the alignment.
+    Arrays of object dtype hold pointers to Python integers, alignment is irrelevant for them.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.hasobject:
+        return np.zeros(n, dtype=dtype)
+
+    # over-allocate by align bytes and start the array at the first aligned address of the buffer
+    buffer = np.zeros(n * dtype.itemsize + align, dtype=np.uint8)
+    offset = -buffer.ctypes.data % align
+    return buffer[offset:offset + n * dtype.itemsize].view(dtype)
+
+
+def reduce_by_negacyclic(c: np.ndarray, n: int) -> np.ndarray:
+    """
+    Compute the remainder of the division of a polynomial (starting from the highest degree coefficient) by x^n+1 in O(len(c)).
+    Since x^n = -1, the chunk of coefficients of degree kn to kn+n-1 is added to the remainder with sign (-1)^k.
+
+    Returns the n coefficients of the remainder, starting from the highest degree coefficient.
+    """
+    c = into_coefficient_array(c)
+    chunks = -(-len(c) // n)
+
+    if chunks <= 1:
+        return pad_coefficients(c, n)
+
+    # the sum of the chunks may exceed the int64 range even if every coefficient fits
+    if c.dtype == np.int64 and chunks * int(np.abs(c).max()) >= 2**63:
+        c = c.astype(object)
+
+    out = c[-n:].copy()
+    i = len(c) - 2 * n
+    sign = -1
+    while i > -n:
+        # the first chunk may be partial, it holds the highest degree coefficients of its chunk
+        start = max(i, 0)
+        if sign < 0:
+            out[start - i:] -= c[start:i + n]
+        else:
+            out[start - i:] += c[start:i + n]
+        i -= n
+        sign = -sign
+
+    return into_coefficient_array(out)
 
 
-def poly_div(dividend: list[int], divisor: list[int]) -> tuple[list[int], list[int]]:
+def _poly_div(dividend: list[int], divisor: list[int]) -> tuple[list[int], list[int]]:
+    """
+    Schoolbook polynomial long division in O(len(dividend) * len(divisor)).
+    Reductions modulo x^n+1 go through `reduce_by_negacyclic`, this is only kept as a reference for the tests.
+    """
     # assert that the leading coefficient of the divisor is not zero
     assert divisor[0] != 0
 
@@ -150,49 +383,35 @@ def poly_div(dividend: list[int], divisor: list[int]) -> tuple[list[int], list[i
     return quotient, remainder
 
 
-def poly_add(poly1: list[int], poly2: list[int]) -> list[int]:
+def poly_add(poly1: np.ndarray, poly2: np.ndarray) -> np.ndarray:
     # Find the length of the longer polynomial
     max_length = max(len(poly1), len(poly2))
     
     # Pad the shorter polynomial with zeros at the beginning
-    poly1 = [0] * (max_length - len(poly1)) + poly1
-    poly2 = [0] * (max_length - len(poly2)) + poly2
+    poly1 = pad_coefficients(poly1, max_length)
+    poly2 = pad_coefficients(poly2, max_length)
 
     # Add corresponding coefficients
-    result = [poly1[i] + poly2[i] for i in range(max_length)]
-    
-    return result
+    return np.add(poly1, poly2)
 
-def poly_sub(poly1: list[int], poly2: list[int]) -> list[int]:
+def poly_sub(poly1: np.ndarray, poly2: np.ndarray) -> np.ndarray:
     # Find the length of the longer polynomial
     max_length = max(len(poly1), len(poly2))
     
     # Pad the shorter polynomial with zeros at the beginning
-    poly1 = [0] * (max_length - len(poly1)) + poly1
-    poly2 = [0] * (max_length - len(poly2)) + poly2
-    
-    result = [poly1[i] - poly2[i] for i in range(max_length)]
+    poly1 = pad_coefficients(poly1, max_length)
+    poly2 = pad_coefficients(poly2, max_length)
     
-    return result
+    return np.subtract(poly1, poly2)
     
-def get_centered_remainder(x, modulus) -> int:
-    """
-    Returns the centered remainder of x with respect to modulus.
-    """
-    r = x % modulus
-    return r if r <= modulus / 2 else r - modulus
-
-def get_standard_form(x, modulus) -> int:
-    """
-    Returns the standard form of x with respect to modulus.
-    """
-    r = x % modulus
-    return r if r >= 0 else r + modulus
-
-def poly_mul_naive(poly1: list[int], poly2: list[int]) -> list[int]:
+def poly_mul_naive(poly1: Union[list[int], np.ndarray], poly2: Union[list[int], np.ndarray]) -> list[int]:
     """
     Naive polynomial multiplication
     """
+    # multiply over Python integers so that the products cannot overflow
+    poly1 = [int(coeff) for coeff in poly1]
+    poly2 = [int(coeff) for coeff in poly2]
+
     product_len = len(poly1) + len(poly2) - 1
     product = [0] * product_len
 
@@ -202,3 +421,127 @@ def poly_mul_naive(poly1: list[int], poly2: list[int]) -> list[int]:
             product[i + j] += poly1[i] * poly2[j]
 
     return product
+
+# Bound on the absolute value of the coefficients of a product computed via floating point FFT. Far enough from 2^53 so that the rounding error of the FFT stays below 1/2.
+FFT_COEFFICIENT_BOUND = 2**40
+
+def poly_mul(poly1: np.ndarray, poly2: np.ndarray) -> np.ndarray:
+    """
+    Polynomial multiplication as a convolution of the coefficients.
+    Depending on the bound on the coefficients of the product, the convolution is computed:
+    - via floating point FFT if the bound is small enough for the result to be exact after rounding.
+    - over int64 if the bound fits in int64.
+    - over Python integers otherwise.
+    """
+    if len(poly1) == 0 or len(poly2) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    if poly1.dtype == np.int64 and poly2.dtype == np.int64:
+        bound = poly_mul_bound(poly1, poly2)
+        if bound < FFT_COEFFICIENT_BOUND:
+            return poly_mul_fft(poly1, poly2)
+        if bound < INT64_COEFFICIENT_BOUND:
+            return np.convolve(poly1, poly2)
+
+    return np.convolve(poly1.astype(object), poly2.astype(object))
+
+def poly_mul_bound(poly1: np.ndarray, poly2: np.ndarray) -> int:
+    """
+    Bound on the absolute value of the coefficients of the product of two non-empty polynomials, also valid for their product reduced by x^n+1.
+    """
+    # each coefficient of the product is the sum of at most min(len(poly1), len(poly2)) products
+    return int(np.abs(poly1).max()) * int(np.abs(poly2).max()) * min(len(poly1), len(poly2))
+
+def poly_mul_fft(poly1: np.ndarray, poly2: np.ndarray) -> np.ndarray:
+    """
+    Polynomial multiplication via floating point FFT.
+    The result is exact only if the coefficients of the product are bounded by FFT_COEFFICIENT_BOUND.
+    """
+    product_len = len(poly1) + len(poly2) - 1
+    fft_size = 1 << (product_len - 1).bit_length()
+
+    # the coefficients are real, so the real FFT computes half of the evaluations
+    evals1 = np.fft.rfft(poly1, fft_size)
+    evals2 = np.fft.rfft(poly2, fft_size)
+    product = np.fft.irfft(evals1 * evals2, fft_size)[:product_len]
+
+    return np.rint(product).astype(np.int64)
+
+def poly_mul_fft_in_ring_is_exact(poly1: np.ndarray, poly2: np.ndarray, ring: PolynomialRing) -> bool:
+    """
+    Check if `poly_mul_fft_in_ring` computes the exact product of the polynomials in the ring.
+    """
+    return (
+        ring.modulus % 2 == 1
+        and 0 < len(poly1) <= ring.n
+        and 0 < len(poly2) <= ring.n
+        and poly1.dtype == np.int64
+        and poly2.dtype == np.int64
+        and poly_mul_bound(poly1, poly2) < FFT_COEFFICIENT_BOUND
+    )
+
+def poly_mul_fft_in_ring(poly1: np.ndarray, poly2: np.ndarray, ring: PolynomialRing) -> np.ndarray:
+    """
+    Multiply two polynomials of degree < n in the ring R_q = Z_q[x]/(x^n+1) via floating point FFT.
+    The rounded product is reduced by x^n+1 and by q (see `get_centered_remainder_fp`) in floating point, before being turned into integers.
+    The result is exact only if the conditions of `poly_mul_fft_in_ring_is_exact` hold.
+
+    Returns the coefficients of the product in centered form, starting from the highest degree coefficient.
+    """
+    n = ring.n
+
+    # the linear product has degree < 2n - 1
+    evals1 = np.fft.rfft(poly1[::-1], 2 * n)
+    evals2 = np.fft.rfft(poly2[::-1], 2 * n)
+    product = np.rint(np.fft.irfft(evals1 * evals2, 2 * n))[::-1]
+
+    # since x^n = -1, the coefficients of degree >= n are subtracted from the coefficients of degree < n
+    folded = product[n:] - product[:n]
+
+    return get_centered_remainder_fp(folded, ring.modulus)
+
+def poly_to_ntt(poly: np.ndarray, ring: PolynomialRing) -> np.ndarray:
+    """
+    Compute the negacyclic NTT evaluations of a polynomial (starting from the highest degree coefficient) in the ring R_q = Z_q[x]/(x^n+1).
+    The modulus q of the ring must be a prime congruent to 1 mod 2n.
+
+    Returns the evaluations in [0, q) in bit-reversed order.
+    """
+    n = ring.n
+    q = ring.modulus
+    tables = ring.ntt_tables
+
+    if len(poly) > n:
+        poly = reduce_by_negacyclic(poly, n)
+
+    # the NTT operates on the coefficients starting from the lowest degree coefficient
+    standard = get_standard_form(poly, q)
+    coeffs = _aligned_zeros(n, ntt_dtype(q))
+    coeffs[:len(standard)] = standard[::-1]
+    return ntt_forward(coeffs, q, tables.psi_pows, tables.psi_pre)
+
+def ntt_to_poly(ntt_evals: np.ndarray, ring: PolynomialRing) -> np.ndarray:
+    """
+    Recover the coefficients of a polynomial of the ring R_q = Z_q[x]/(x^n+1) from its negacyclic NTT evaluations in bit-reversed order.
+    The evaluations are left untouched.
+
+    Returns the coefficients in centered form, starting from the highest degree coefficient.
+    """
+    q = ring.modulus
+    tables = ring.ntt_tables
+
+    # the inverse NTT is performed in place
+    coeffs = ntt_inverse(ntt_evals.copy(), q, tables.inv_psi_pows, tables.inv_psi_pre, tables.n_inv, tables.n_inv_pre)
+    # reversing the coefficients into a contiguous array lets the batched reduction run in the C extension `bfv._modarith`
+    return get_centered_remainder(np.ascontiguousarray(into_coefficient_array(coeffs)[::-1]), q)
+
+def poly_mul_ntt(poly1: np.ndarray, poly2: np.ndarray, ring: PolynomialRing) -> np.ndarray:
+    """
+    Multiply two polynomials in the ring R_q = Z_q[x]/(x^n+1) using the negacyclic NTT, which performs the convolution and the reduction by x^n+1 at once.
+    The modulus q of the ring must be a prime congruent to 1 mod 2n.
+
+    Returns the coefficients of the product in centered form, starting from the highest degree coefficient.
+    """
+    # evaluations are both in bit-reversed order, no reordering is needed before the inverse NTT
+    ntt_product = ntt_pointwise_mul(poly_to_ntt(poly1, ring), poly_to_ntt(poly2, ring), ring.modulus)
+    return ntt_to_poly(ntt_product, ring)
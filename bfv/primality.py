@@ -0,0 +1,59 @@
+from typing import List
+
+def small_primes(bound: int) -> List[int]:
+    """
+    Generate the primes smaller than bound using the sieve of Eratosthenes.
+    """
+    sieve = [True] * bound
+    sieve[0:2] = [False] * min(2, bound)
+    for i in range(2, int(bound**0.5) + 1):
+        if sieve[i]:
+            sieve[i * i :: i] = [False] * len(range(i * i, bound, i))
+    return [i for i in range(bound) if sieve[i]]
+
+SMALL_PRIMES_BOUND = 1000
+SMALL_PRIMES = small_primes(SMALL_PRIMES_BOUND)
+
+# Miller-Rabin witnesses that make the test deterministic for n < 2^32
+WITNESSES_32_BITS = [2, 7, 61]
+# Miller-Rabin witnesses that make the test deterministic for n < 3,317,044,064,679,887,385,961,981 (which covers every n < 2^64)
+WITNESSES_64_BITS = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
+
+def is_probable_prime(n: int) -> bool:
+    """
+    Check if n is prime by trial division by the primes smaller than 1000 followed by the Miller-Rabin test.
+    The test is deterministic for n < 3,317,044,064,679,887,385,961,981. For larger n, a composite passes the test with probability at most 4^-12.
+    """
+    if n < 2:
+        return False
+
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+
+    # n has no prime factor smaller than 1000, so it is prime if it is smaller than 1000^2
+    if n < SMALL_PRIMES_BOUND**2:
+        return True
+
+    # write n - 1 = d * 2^s with d odd
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    witnesses = WITNESSES_32_BITS if n < 2**32 else WITNESSES_64_BITS
+
+    for a in witnesses:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            # a is a witness of the compositeness of n
+            return False
+
+    return True
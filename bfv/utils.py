@@ -1,6 +1,12 @@
 from typing import List
 import math
-    
+import numpy as np
+
+try:
+    from bfv import _modarith
+except ImportError:
+    _modarith = None
+
 def are_coprime(a, b):
     """Check if a and b are coprime, i.e., gcd(a, b) == 1."""
     return math.gcd(a, b) == 1
@@ -29,3 +35,48 @@ def find_odd_pairwise_coprimes(base: int, count: int, max_step=1000) -> List[int
             break
     assert len(coprimes) == count, "Failed to find enough coprime numbers"
     return coprimes
+
+def get_centered_remainder(x, modulus):
+    """
+    Returns the centered remainder of x with respect to modulus. x is either an integer or a NumPy array of integers.
+    """
+    if _modarith is not None and _fits_modarith(x, modulus):
+        out = np.empty_like(x)
+        _modarith.centered_remainder(x, modulus, out)
+        return out
+    r = get_standard_form(x, modulus)
+    if isinstance(r, np.ndarray):
+        return np.where(r > modulus // 2, r - modulus, r)
+    return r if r <= modulus // 2 else r - modulus
+
+def get_standard_form(x, modulus):
+    """
+    Returns the standard form of x with respect to modulus. x is either an integer or a NumPy array of integers.
+    """
+    if _modarith is not None and _fits_modarith(x, modulus):
+        out = np.empty_like(x)
+        _modarith.standard_form(x, modulus, out)
+        return out
+    if isinstance(x, np.ndarray):
+        # a modulus that doesn't fit in int64 requires arithmetic over Python integers
+        if x.dtype != object and modulus >= 2**63:
+            x = x.astype(object)
+        return x % modulus
+    r = x % modulus
+    return r if r >= 0 else r + modulus
+
+def _fits_modarith(x, modulus) -> bool:
+    """
+    Whether the reduction of x by modulus can run in the C extension `bfv._modarith`: x is a contiguous int64 array and 0 < modulus < 2^63.
+    """
+    return isinstance(x, np.ndarray) and x.dtype == np.int64 and x.flags.c_contiguous and 0 < modulus < 2**63
+
+def get_centered_remainder_fp(x: np.ndarray, modulus: int) -> np.ndarray:
+    """
+    Returns the centered remainder of x with respect to an odd modulus as an int64 array, computed in floating point as x - modulus * floor(x / modulus + 1/2).
+    x is a float64 NumPy array of integers such that |x| < 2^50. Within this bound x / modulus is computed accurately enough
+    to never be rounded across a half-integer (which it is at least 1/(2 * modulus) away from since the modulus is odd), so the result is exact.
+    """
+    assert modulus % 2 == 1, "modulus must be odd"
+    quotient = np.floor(x * (1 / modulus) + 0.5)
+    return (x - quotient * modulus).astype(np.int64)
@@ -1,6 +1,6 @@
 import argparse
 import json
-from bfv.polynomial import Polynomial
+from bfv.polynomial import Polynomial, pad_coefficients
 from bfv.bfv import BFV, RLWE
 from bfv.discrete_gauss import DiscreteGaussian
 import time
@@ -36,13 +36,13 @@ def main(args):
     print(f"Time to generate public key: {pk_gen_elapsed_time:.6f} seconds")
 
     # Add zeroes at the beginning of the u polynomial to make it the same degree as the public key
-    u.coefficients = u.coefficients = [0] * (n - len(u.coefficients)) + u.coefficients
+    u.coefficients = pad_coefficients(u.coefficients, n)
 
     # Generate message (plaintext)
     message = bfv.rlwe.Rt.sample_polynomial()
 
     # Add zeroes at the beginning of the message polynomial to make it the same degree as the public key
-    message.coefficients = message.coefficients = [0] * (n - len(message.coefficients)) + u.coefficients
+    message.coefficients = pad_coefficients(u.coefficients, n)
 
     encrypt_start_time = time.time()
 
@@ -77,15 +77,15 @@ def main(args):
     with open(args.output, "w") as f:
         json.dump(
             {
-                "pk0": public_key[0].into_standard_form(q).coefficients,
-                "pk1": public_key[1].into_standard_form(q).coefficients,
-                "m": message.into_standard_form(q).coefficients,
-                "u": u.into_standard_form(q).coefficients,
-                "e0": e0.into_standard_form(q).coefficients,
-                "e1": e1.into_standard_form(q).coefficients,
-                "c0": c0.into_standard_form(q).coefficients,
-                "c1": c1.into_standard_form(q).coefficients,
-                "cyclo": Polynomial(bfv.rlwe.Rq.denominator).into_standard_form(q).coefficients,
+                "pk0": public_key[0].into_standard_form(q).coefficients.tolist(),
+                "pk1": public_key[1].into_standard_form(q).coefficients.tolist(),
+                "m": message.into_standard_form(q).coefficients.tolist(),
+                "u": u.into_standard_form(q).coefficients.tolist(),
+                "e0": e0.into_standard_form(q).coefficients.tolist(),
+                "e1": e1.into_standard_form(q).coefficients.tolist(),
+                "c0": c0.into_standard_form(q).coefficients.tolist(),
+                "c1": c1.into_standard_form(q).coefficients.tolist(),
+                "cyclo": Polynomial(bfv.rlwe.Rq.denominator).into_standard_form(q).coefficients.tolist(),
             },
             f,
         )
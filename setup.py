@@ -1,4 +1,4 @@
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
 
 setup(
     name="bfv",
@@ -7,6 +7,25 @@ setup(
     install_requires=[
         "numpy",
         "scipy",
+        "galois",
+        "numba",
+    ],
+    # optional C implementation of the NTT, the Numba implementation is used when it is not built
+    ext_modules=[
+        Extension(
+            "bfv._ntt",
+            sources=["bfv/_ntt.c"],
+            # no -march: the AVX-512 IFMA functions enable their instruction set through target attributes and are selected at runtime
+            extra_compile_args=["-O3"],
+            optional=True,
+        ),
+        # optional C implementation of the batched modular reductions of bfv/utils.py, NumPy is used when it is not built
+        Extension(
+            "bfv._modarith",
+            sources=["bfv/_modarith.c"],
+            extra_compile_args=["-O3"],
+            optional=True,
+        ),
     ],
     author="Enrico Bottazzi, Yuriko Nishijima",
 )
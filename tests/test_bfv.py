@@ -1,7 +1,8 @@
 import unittest
+import numpy as np
 from bfv.discrete_gauss import DiscreteGaussian
 from bfv.polynomial import PolynomialRing, Polynomial
-from bfv.bfv import RLWE, BFV, BFVCrt
+from bfv.bfv import RLWE, BFV, BFVCrt, Ciphertext, PublicKey
 from bfv.crt import CRTModuli
 from mpmath import *
 
@@ -38,6 +39,10 @@ class TestRLWE(unittest.TestCase):
         for coeff in key.coefficients:
             self.assertTrue(coeff == -1 or coeff == 0 or coeff == 1)
 
+        # Ensure that every value of the ternary set is sampled and that the coefficients are stored as int64
+        self.assertEqual(set(key.coefficients.tolist()), {-1, 0, 1})
+        self.assertEqual(key.coefficients.dtype, np.int64)
+
     def test_sample_from_chi_error_distribution(self):
         error = self.rlwe.SampleFromErrorDistribution()
         # Ensure that the degree of the sample polynomial is at most n-1, which means the has at most n coefficients
@@ -46,6 +51,7 @@ class TestRLWE(unittest.TestCase):
         # Ensure that the secret key is sampled from the error distribution by checking that each coefficient is within the range of the error distribution
         for coeff in error.coefficients:
             self.assertTrue(coeff >= -6 * self.sigma and coeff <= 6 * self.sigma)
+        self.assertEqual(error.coefficients.dtype, np.int64)
 
 
 class TestBFV(unittest.TestCase):
@@ -92,6 +98,13 @@ class TestBFV(unittest.TestCase):
                 and coeff <= upper_bound
             )
 
+        # pk1 = -a, and both halves carry their NTT evaluations in Rq
+        self.assertIsInstance(public_key, PublicKey)
+        self.assertEqual(public_key.pk1, Polynomial(-a.coefficients))
+        if self.bfv.rlwe.Rq.ntt_tables is not None:
+            self.assertTrue(public_key.pk0.has_ntt(self.bfv.rlwe.Rq))
+            self.assertTrue(public_key.pk1.has_ntt(self.bfv.rlwe.Rq))
+
     def test_message_sample(self):
         message = self.bfv.rlwe.Rt.sample_polynomial()
 
@@ -161,6 +174,28 @@ class TestBFV(unittest.TestCase):
         for i in range(len(message.coefficients)):
             self.assertEqual(message.coefficients[i], dec.coefficients[i])
 
+    def test_valid_public_key_decryption_int64_rounding(self):
+        # t*q fits in 63 bits, the rounding of the decryption runs in int64 arithmetic
+        rlwe = RLWE(1024, 1099511592961, 17, DiscreteGaussian(3.2))
+        bfv = BFV(rlwe)
+        secret_key = bfv.SecretKeyGen()
+        e = rlwe.SampleFromErrorDistribution()
+        a = rlwe.Rq.sample_polynomial()
+        public_key = bfv.PublicKeyGen(secret_key, e, a)
+
+        message = rlwe.Rt.sample_polynomial()
+
+        e0 = rlwe.SampleFromErrorDistribution()
+        e1 = rlwe.SampleFromErrorDistribution()
+        u = rlwe.SampleFromTernaryDistribution()
+
+        ciphertext = bfv.PubKeyEncrypt(public_key, message, e0, e1, u)
+
+        dec = bfv.Decrypt(secret_key, ciphertext)
+
+        self.assertEqual(dec.coefficients.dtype, np.int64)
+        self.assertEqual(message, dec)
+
     def test_valid_secret_key_decryption(self):
         secret_key = self.bfv.SecretKeyGen()
         message = self.bfv.rlwe.Rt.sample_polynomial()
@@ -175,6 +210,26 @@ class TestBFV(unittest.TestCase):
         for i in range(len(message.coefficients)):
             self.assertEqual(message.coefficients[i], dec.coefficients[i])
 
+    def test_ciphertext_lazy_reduction(self):
+        Rq = self.bfv.rlwe.Rq
+        polys = [(Rq.sample_polynomial(), Rq.sample_polynomial()) for _ in range(10)]
+
+        # accumulate the ciphertexts, the reduction is deferred until the bound of the coefficients reaches 2^62
+        total = Ciphertext.from_polynomials(*polys[0], Rq)
+        for ct0, ct1 in polys[1:]:
+            total = total + Ciphertext.from_polynomials(ct0, ct1, Rq)
+            self.assertTrue(total.bound < 2**62)
+        self.assertTrue(total.bound > Rq.modulus // 2)
+
+        # accessing ct0 and ct1 reduces the coefficients in Rq
+        for i in range(2):
+            expected = polys[0][i]
+            for poly in polys[1:]:
+                expected = expected + poly[i]
+            expected.reduce_in_ring(Rq)
+            self.assertEqual(total[i], expected)
+        self.assertEqual(total.bound, Rq.modulus // 2)
+
     def test_eval_add(self):
         secret_key = self.bfv.SecretKeyGen()
         e = self.bfv.rlwe.SampleFromErrorDistribution()
@@ -204,6 +259,13 @@ class TestBFV(unittest.TestCase):
 
         ciphertext_sum = self.bfv.EvalAdd(ciphertext1, ciphertext2)
 
+        # Ensure that the ciphertext_sum matches the sum of the polynomials of the ciphertexts reduced in Rq
+        self.assertIsInstance(ciphertext_sum, Ciphertext)
+        for i in range(2):
+            ct = ciphertext1[i] + ciphertext2[i]
+            ct.reduce_in_ring(self.bfv.rlwe.Rq)
+            self.assertEqual(ciphertext_sum[i], ct)
+
         # Ensure that the ciphertext_sum is a polynomial in Rq
         # Ensure that the ciphertext_sum of the ciphertext are within the range [-(q-1)/2, (q-1)/2]
         lower_bound = -(self.bfv.rlwe.Rq.modulus - 1) / 2 # inclusive
@@ -429,3 +491,33 @@ class TestBFVVWithCRT(unittest.TestCase):
         message_prime = self.bfv_crt.DecryptDummy(s, ciphertexts)
 
         assert message_prime == message
+
+    def test_eval_add(self):
+        s = self.bfv_crt.SecretKeyGen()
+        e = self.bfv_crt.bfv_q.rlwe.SampleFromErrorDistribution()
+        ais = []
+        for i in range(len(self.crt_moduli.qis)):
+            ais.append(self.bfv_crt.bfv_qis[i].rlwe.Rq.sample_polynomial())
+
+        pub_keys = self.bfv_crt.PublicKeyGen(s, e, ais)
+
+        message1 = self.bfv_crt.bfv_q.rlwe.Rt.sample_polynomial()
+        message2 = self.bfv_crt.bfv_q.rlwe.Rt.sample_polynomial()
+        message_sum = message1 + message2
+        message_sum.reduce_in_ring(self.bfv_crt.bfv_q.rlwe.Rt)
+
+        e0 = self.bfv_crt.bfv_q.rlwe.SampleFromErrorDistribution()
+        e1 = self.bfv_crt.bfv_q.rlwe.SampleFromErrorDistribution()
+        u = self.bfv_crt.bfv_q.rlwe.SampleFromTernaryDistribution()
+        ciphertexts1 = self.bfv_crt.PubKeyEncrypt(pub_keys, message1, e0, e1, u)
+
+        e0 = self.bfv_crt.bfv_q.rlwe.SampleFromErrorDistribution()
+        e1 = self.bfv_crt.bfv_q.rlwe.SampleFromErrorDistribution()
+        u = self.bfv_crt.bfv_q.rlwe.SampleFromTernaryDistribution()
+        ciphertexts2 = self.bfv_crt.PubKeyEncrypt(pub_keys, message2, e0, e1, u)
+
+        ciphertexts_sum = self.bfv_crt.EvalAdd(ciphertexts1, ciphertexts2)
+
+        message_prime = self.bfv_crt.Decrypt(s, ciphertexts_sum)
+
+        assert message_prime == message_sum
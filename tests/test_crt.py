@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 
 from bfv.crt import CRTModuli, CRTInteger, CRTPolynomial
 from bfv.polynomial import PolynomialRing, Polynomial, poly_mul_naive
@@ -66,7 +67,7 @@ class TestPolynomialWithCRTAndRandomCoprimes(unittest.TestCase):
             rqi_polynomials, self.n, self.crt_moduli
         )
 
-        assert a.coefficients == a_recovered.coefficients
+        assert np.array_equal(a.coefficients, a_recovered.coefficients)
 
     def test_valid_poly_addition_in_crt_representation(self):
         a = self.rq.sample_polynomial()
@@ -97,7 +98,7 @@ class TestPolynomialWithCRTAndRandomCoprimes(unittest.TestCase):
         )
 
         # ensure that a + b = c
-        assert c.coefficients == c_recovered.coefficients
+        assert np.array_equal(c.coefficients, c_recovered.coefficients)
 
     def test_valid_poly_mul_in_crt_representation(self):
         a = self.rq.sample_polynomial()
@@ -127,4 +128,4 @@ class TestPolynomialWithCRTAndRandomCoprimes(unittest.TestCase):
         )
 
         # ensure that c_recovered = c
-        assert c.coefficients == c_recovered.coefficients
\ No newline at end of file
+        assert np.array_equal(c.coefficients, c_recovered.coefficients)
\ No newline at end of file
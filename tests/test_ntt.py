@@ -1,8 +1,9 @@
 import unittest
+import numpy as np
 import random
 import galois
-from bfv.ntt import ntt_poly_mul
-from bfv.polynomial import poly_mul_naive
+from bfv.ntt import ntt_poly_mul, ntt_pointwise_mul, barrett_precomputation, _pointwise_mul_barrett, bit_reverse, find_primitive_2nth_root_of_unity, negacyclic_ntt_tables, ntt_dtype, ntt_forward, ntt_inverse, find_ntt_primes, IFMA_NTT_MAX_BITS, _ntt, _ntt_ct, _intt_gs
+from bfv.polynomial import PolynomialRing, Polynomial, poly_add, poly_mul_naive, poly_sub
 
 class TestNTT(unittest.TestCase):
 
@@ -65,3 +66,163 @@ class TestNTT(unittest.TestCase):
         for i in range(len(product)):
             assert product[i] == product_naive[i]
 
+class TestNegacyclicNTT(unittest.TestCase):
+
+    def test_negacyclic_ntt_tables(self):
+        # q = 1 mod 2n and q is prime
+        self.assertIsNotNone(negacyclic_ntt_tables(1024, 1152921504606584833))
+        # q is prime but q != 1 mod 2n
+        self.assertIsNone(negacyclic_ntt_tables(1024, 7))
+        # q = 1 mod 2n but q is not prime
+        self.assertIsNone(negacyclic_ntt_tables(1024, 2049 * 4097))
+
+        # the tables are computed once per (n, q) and shared by the rings
+        self.assertIs(PolynomialRing(1024, 12289).ntt_tables, PolynomialRing(1024, 12289).ntt_tables)
+
+    def test_ntt_forward_inverse(self):
+        n = 1024
+        # the first three moduli use the compiled NTT (the third one being the largest supported size), the last one the Python fallback
+        for q in [12289, 1152921504606584833, 4611686018427322369, 18446744073709608961]:
+            tables = negacyclic_ntt_tables(n, q)
+            coeffs = np.array([random.randint(0, q - 1) for _ in range(n)], dtype=ntt_dtype(q))
+
+            # Go from coefficients to NTT evaluations and back to coefficients and check if they are the same
+            ntt_evals = ntt_forward(coeffs.copy(), q, tables.psi_pows, tables.psi_pre)
+            ntt_coeffs = ntt_inverse(ntt_evals, q, tables.inv_psi_pows, tables.inv_psi_pre, tables.n_inv, tables.n_inv_pre)
+            assert np.array_equal(ntt_coeffs, coeffs)
+
+    def test_ntt_pointwise_mul(self):
+        n = 4096
+        # 33 bits, a 60-bit prime and the largest size supported by the compiled multiplication
+        for q in [8589987841, 1152921504606584833, 4611686018427322369]:
+            A = np.array([random.randint(0, q - 1) for _ in range(n)] + [q - 1], dtype=np.uint64)
+            B = np.array([random.randint(0, q - 1) for _ in range(n)] + [q - 1], dtype=np.uint64)
+
+            # compare against the product modulo q over Python integers
+            expected = (A.astype(object) * B.astype(object)) % q
+            product = ntt_pointwise_mul(A, B, q)
+            self.assertEqual(product.dtype, np.uint64)
+            self.assertTrue(np.array_equal(product.astype(object), expected))
+
+            # the Numba kernel is used when the C extension is not built
+            out = np.empty_like(A)
+            _pointwise_mul_barrett(A, B, out, np.uint64(q), np.uint64(barrett_precomputation(q)), np.uint64(q.bit_length()))
+            self.assertTrue(np.array_equal(out.astype(object), expected))
+
+    def test_ntt_forward_bit_reversed_order(self):
+        n = 16
+        log_n = 4
+        # the first moduli use the compiled NTT, the last one the Python fallback
+        for q in [12289, 1152921504606584833, 18446744073709608961]:
+            tables = negacyclic_ntt_tables(n, q)
+            psi = find_primitive_2nth_root_of_unity(n, q)
+            coeffs = [random.randint(0, q - 1) for _ in range(n)]
+
+            ntt_evals = ntt_forward(np.array(coeffs, dtype=ntt_dtype(q)), q, tables.psi_pows, tables.psi_pre)
+
+            # the evaluation at index i is the evaluation of the polynomial at the odd power ψ^(2*bitrev(i)+1), no permutation is applied
+            for i in range(n):
+                x = pow(psi, 2 * bit_reverse(i, log_n) + 1, q)
+                self.assertEqual(int(ntt_evals[i]), sum(c * pow(x, j, q) for j, c in enumerate(coeffs)) % q)
+
+    def test_poly_mul_negacyclic_ntt(self):
+        n = 1024
+        # the first three moduli use the compiled NTT (the third one being the largest supported size), the last one the Python fallback
+        for q in [12289, 1152921504606584833, 4611686018427322369, 18446744073709608961]:
+            Rq = PolynomialRing(n, q)
+            a = Rq.sample_polynomial()
+            b = Rq.sample_polynomial()
+
+            # a and b live in Rq, the product is computed via negacyclic NTT
+            product = a * b
+
+            # multiply the polynomials naively and reduce the product in Rq
+            product_naive = Polynomial(poly_mul_naive(a.coefficients, b.coefficients))
+            product_naive.reduce_in_ring(Rq)
+
+            assert np.array_equal(product.coefficients, product_naive.coefficients)
+
+    def test_ntt_domain_operations(self):
+        n = 1024
+        for q in [12289, 1152921504606584833, 18446744073709608961]:
+            Rq = PolynomialRing(n, q)
+            a = Rq.sample_polynomial()
+            b = Rq.sample_polynomial()
+
+            # the NTT evaluations of the operands are cached by the multiplication
+            product = a * b
+            assert a.has_ntt(Rq) and b.has_ntt(Rq)
+
+            # going back and forth between the coefficients and the NTT evaluations
+            c = Polynomial.from_ntt(a.to_ntt(Rq), Rq)
+            assert np.array_equal(c.coefficients, a.coefficients)
+
+            # additions and subtractions of cached polynomials are computed on the NTT evaluations
+            for result, coefficients in [
+                (product + a, poly_add(product.coefficients, a.coefficients)),
+                (product - b, poly_sub(product.coefficients, b.coefficients)),
+            ]:
+                assert result.has_ntt(Rq)
+                expected = Polynomial(coefficients)
+                expected.reduce_in_ring(Rq)
+                assert np.array_equal(result.coefficients, expected.coefficients)
+
+            # updating the coefficients invalidates the cached NTT evaluations
+            a.coefficients = b.coefficients
+            assert not a.has_ntt(Rq)
+            assert np.array_equal(a.to_ntt(Rq), b.to_ntt(Rq))
+
+    @unittest.skipIf(_ntt is None, "the C extension bfv._ntt is not built")
+    def test_c_extension_matches_numba(self):
+        for n, q in [(2, 12289), (1024, 12289), (1024, 1152921504606584833), (4096, 1152921504606584833), (4096, 4611686018427322369)]:
+            tables = negacyclic_ntt_tables(n, q)
+            coeffs = np.array([random.randint(0, 4 * q - 1) for _ in range(n)], dtype=np.uint64)
+
+            ntt_evals = coeffs.copy()
+            _ntt.ntt_ct_harvey(ntt_evals, tables.psi_pows, tables.psi_pre, q)
+            ntt_evals_numba = coeffs.copy()
+            _ntt_ct(ntt_evals_numba, tables.psi_pows, tables.psi_pre, np.uint64(q))
+            assert np.array_equal(ntt_evals, ntt_evals_numba)
+
+            # the inverse NTT takes evaluations in [0, 2q)
+            evals = coeffs % np.uint64(2 * q)
+            ntt_coeffs = evals.copy()
+            _ntt.intt_gs_harvey(ntt_coeffs, tables.inv_psi_pows, tables.inv_psi_pre, q, tables.n_inv, tables.n_inv_pre)
+            ntt_coeffs_numba = evals.copy()
+            _intt_gs(ntt_coeffs_numba, tables.inv_psi_pows, tables.inv_psi_pre, np.uint64(q), np.uint64(tables.n_inv), np.uint64(tables.n_inv_pre))
+            assert np.array_equal(ntt_coeffs, ntt_coeffs_numba)
+
+    def test_find_ntt_primes(self):
+        n = 1024
+        primes = find_ntt_primes(n, IFMA_NTT_MAX_BITS, 3)
+        self.assertEqual(len(primes), 3)
+        self.assertEqual(primes, sorted(primes, reverse=True))
+        for q in primes:
+            self.assertTrue(q < 2**IFMA_NTT_MAX_BITS)
+            self.assertIsNotNone(negacyclic_ntt_tables(n, q))
+
+        # 12289 is the largest prime q < 2^14 such that q = 1 mod 2048
+        self.assertEqual(find_ntt_primes(1024, 14, 1), [12289])
+        with self.assertRaises(ValueError):
+            find_ntt_primes(1024, 14, 2)
+
+    @unittest.skipIf(_ntt is None or not _ntt.IFMA_SUPPORTED, "the C extension bfv._ntt is not built or the CPU doesn't support AVX-512 IFMA")
+    def test_c_extension_ifma_matches_numba(self):
+        # the IFMA NTT runs for moduli of up to 50 bits and n >= 16, the smallest sizes only have scalar stages
+        for n in [16, 32, 1024, 4096]:
+            for q in find_ntt_primes(n, IFMA_NTT_MAX_BITS, 2) + [find_ntt_primes(n, 20, 1)[0]]:
+                tables = negacyclic_ntt_tables(n, q)
+                coeffs = np.array([random.randint(0, 4 * q - 1) for _ in range(n)], dtype=np.uint64)
+
+                ntt_evals = coeffs.copy()
+                _ntt.ntt_ct_harvey(ntt_evals, tables.psi_pows, tables.psi_pre, q)
+                ntt_evals_numba = coeffs.copy()
+                _ntt_ct(ntt_evals_numba, tables.psi_pows, tables.psi_pre, np.uint64(q))
+                assert np.array_equal(ntt_evals, ntt_evals_numba)
+
+                evals = coeffs % np.uint64(2 * q)
+                ntt_coeffs = evals.copy()
+                _ntt.intt_gs_harvey(ntt_coeffs, tables.inv_psi_pows, tables.inv_psi_pre, q, tables.n_inv, tables.n_inv_pre)
+                ntt_coeffs_numba = evals.copy()
+                _intt_gs(ntt_coeffs_numba, tables.inv_psi_pows, tables.inv_psi_pre, np.uint64(q), np.uint64(tables.n_inv), np.uint64(tables.n_inv_pre))
+                assert np.array_equal(ntt_coeffs, ntt_coeffs_numba)
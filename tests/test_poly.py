@@ -3,10 +3,16 @@ import numpy as np
 from bfv.polynomial import (
     PolynomialRing,
     Polynomial,
+    poly_mul,
+    _poly_div,
+    reduce_by_negacyclic,
+    poly_mul_fft_in_ring_is_exact,
     poly_mul_naive,
+    _aligned_zeros,
 )
 import random
 from mpmath import *
+from bfv.utils import get_centered_remainder, get_centered_remainder_fp, get_standard_form, _modarith
 
 class TestPolynomialRing(unittest.TestCase):
     def test_init_with_n_and_q(self):
@@ -45,6 +51,23 @@ class TestPolynomialRing(unittest.TestCase):
         self.assertTrue(count1 <= Rq.n)
         self.assertTrue(count2 <= Rq.n)
 
+    def test_sample_poly_alignment(self):
+        # the coefficients of the sampled polynomials start on a 64-byte boundary
+        for q in [7, 1152921504606584833]:
+            Rq = PolynomialRing(1024, q)
+            a = Rq.sample_polynomial()
+            self.assertEqual(a.coefficients.ctypes.data % 64, 0)
+
+    def test_aligned_zeros(self):
+        for n in [1, 7, 1024]:
+            for dtype in [np.int64, np.uint64, object]:
+                a = _aligned_zeros(n, dtype)
+                self.assertEqual(a.shape, (n,))
+                self.assertEqual(a.dtype, dtype)
+                self.assertTrue(np.all(a == 0))
+                if dtype != object:
+                    self.assertEqual(a.ctypes.data % 64, 0)
+
 
 class TestPolynomialInRingRq(unittest.TestCase):
     def test_init_poly_in_ring_Rq(self):
@@ -59,13 +82,28 @@ class TestPolynomialInRingRq(unittest.TestCase):
 
         self.assertTrue(np.array_equal(a.coefficients, [0, 1, 0]))
 
+    def test_init_poly_with_float_coefficients(self):
+        # integer valued floats are accepted, the ones outside the int64 range are converted exactly to Python integers
+        a = Polynomial(np.array([3.0, -2.0, 0.0]))
+        self.assertEqual(a.coefficients.dtype, np.int64)
+        self.assertEqual(a.coefficients.tolist(), [3, -2, 0])
+
+        b = Polynomial(np.array([1e20, -1.0]))
+        self.assertEqual(b.coefficients.dtype, object)
+        self.assertEqual(b.coefficients.tolist(), [10**20, -1])
+
+        # fractional or non finite floats are rejected
+        for coefficients in [[1.7, 2.2], [float("inf")], [float("nan")]]:
+            with self.assertRaises(AssertionError):
+                Polynomial(coefficients)
+
     def test_add_poly(self):
         coefficients_1 = [3, 3, 4, 4, 4]
         coefficients_2 = [3, 2, 0, 1]
         aq1 = Polynomial(coefficients_1)
         aq2 = Polynomial(coefficients_2)
         result = aq1 + aq2
-        assert result.coefficients == [3, 6, 6, 4, 5]
+        assert np.array_equal(result.coefficients, [3, 6, 6, 4, 5])
 
     def test_add_poly_in_ring_Rq(self):
         n = 4
@@ -76,7 +114,7 @@ class TestPolynomialInRingRq(unittest.TestCase):
 
         r.reduce_in_ring(Rq)
 
-        assert r.coefficients == [3, -3, -3, 1]
+        assert np.array_equal(r.coefficients, [3, -3, -3, 1])
 
         coefficients_2 = [3, 3, 2, 0, 1]
         p = Polynomial(coefficients_2)
@@ -86,7 +124,7 @@ class TestPolynomialInRingRq(unittest.TestCase):
 
         result.reduce_in_ring(Rq)
 
-        assert result.coefficients == [-1, -1, -3, -1]
+        assert np.array_equal(result.coefficients, [-1, -1, -3, -1])
 
     def test_mul_poly_in_ring_Rq(self):
         n = 1024
@@ -109,8 +147,84 @@ class TestPolynomialInRingRq(unittest.TestCase):
         poly_product_naive = Polynomial(product_naive)
         poly_product_naive.reduce_in_ring(Rq)
 
-        assert result.coefficients == poly_product_naive.coefficients
+        assert np.array_equal(result.coefficients, poly_product_naive.coefficients)
+
+
+    def test_poly_mul_small_coefficients(self):
+        n = 1024
+        # coefficients of the product are small enough for the product to be computed via FFT
+        coeffs1 = np.array([random.randint(-20, 20) for _ in range(n)])
+        coeffs2 = np.array([random.randint(-1, 1) for _ in range(n)])
+
+        product = poly_mul(coeffs1, coeffs2)
+
+        self.assertEqual(product.dtype, np.int64)
+        assert np.array_equal(product, poly_mul_naive(coeffs1, coeffs2))
+
+        # coefficients of the product fit in int64, the convolution doesn't fall back to Python integers
+        coeffs1 = np.array([random.randint(-2**25, 2**25) for _ in range(n)])
+        coeffs2 = np.array([random.randint(-2**25, 2**25) for _ in range(n)])
+
+        product = poly_mul(coeffs1, coeffs2)
+
+        self.assertEqual(product.dtype, np.int64)
+        assert np.array_equal(product, poly_mul_naive(coeffs1, coeffs2))
+
+    def test_reduce_coefficients_by_cyclo(self):
+        n = 16
+        cyclo = [1] + [0] * (n - 1) + [1]
+        # polynomials shorter than n, up to longer than 2n so that the reduction wraps around several times
+        for length in [1, n - 1, n, n + 1, 2 * n, 3 * n + 5]:
+            for bits in [20, 70]:
+                coeffs = [random.getrandbits(bits) - 2 ** (bits - 1) for _ in range(length)]
+                poly = Polynomial(coeffs)
+                poly.reduce_coefficients_by_cyclo(cyclo)
+
+                # compare against the remainder of the schoolbook division by x^n+1
+                _, remainder = _poly_div(coeffs, cyclo)
+                remainder = [0] * (n - len(remainder)) + remainder
+                self.assertEqual(poly.coefficients.tolist(), remainder)
+                self.assertEqual(reduce_by_negacyclic(np.array(coeffs, dtype=object), n).tolist(), remainder)
+
+        # coefficients that fit in int64 whose folded sums don't
+        coeffs = np.full(3 * n, 2**62 - 1, dtype=np.int64)
+        coeffs[n:2 * n] = -(2**62 - 1)
+        self.assertEqual(reduce_by_negacyclic(coeffs, n).tolist(), [3 * (2**62 - 1)] * n)
+
+    def test_mul_poly_in_ring_Rq_via_fft(self):
+        n = 1024
+        # the moduli are not NTT friendly, the products of small polynomials are computed via floating point FFT
+        for q in [7, 65535, 2**40 + 15]:
+            Rq = PolynomialRing(n, q)
+            poly1 = Polynomial([random.randint(-(2**10), 2**10) for _ in range(n)], Rq)
+            poly2 = Polynomial([random.randint(-(2**10), 2**10) for _ in range(n - 3)], Rq)
+            self.assertTrue(poly_mul_fft_in_ring_is_exact(poly1.coefficients, poly2.coefficients, Rq))
+
+            product = poly1 * poly2
+
+            product_naive = Polynomial(poly_mul_naive(poly1.coefficients, poly2.coefficients))
+            product_naive.reduce_in_ring(Rq)
+
+            self.assertEqual(product, product_naive)
+
+    def test_neg_poly_in_ring_Rq(self):
+        n = 1024
+        q = 1152921504606584833
+        Rq = PolynomialRing(n, q)
+        poly1 = Rq.sample_polynomial()
+        poly2 = Rq.sample_polynomial()
+
+        expected = poly1.scalar_mul(-1)
+        expected.reduce_in_ring(Rq)
+        self.assertEqual(-poly1, expected)
 
+        # the negation of a product only known in the NTT domain stays in the NTT domain
+        product = poly1 * poly2
+        negation = -product
+        self.assertTrue(negation.has_ntt(Rq))
+        expected = product.scalar_mul(-1)
+        expected.reduce_in_ring(Rq)
+        self.assertEqual(negation, expected)
 
     def test_scalar_mul_poly_in_ring_Rq(self):
         n = 1024
@@ -184,4 +298,31 @@ class TestCenteredRemainder(unittest.TestCase):
 
         # assert that the result is in the range [0, mod-1]
         assert res >= 0 and res <= mod - 1
-        assert res == val % mod
\ No newline at end of file
+        assert res == val % mod
+
+    def test_get_centered_remainder_fp(self):
+        for mod in [3, 7, 65537, 2**40 + 15, 2**61 - 1]:
+            # |x| < 2^50, including the values around mod / 2 when they are in range
+            x = [random.randint(-(2**50) + 1, 2**50 - 1) for _ in range(1000)]
+            x += [v for v in [mod // 2, -(mod // 2), mod // 2 + 1, -(mod // 2) - 1] if abs(v) < 2**50]
+            x = np.array(x, dtype=np.int64)
+            res = get_centered_remainder_fp(x.astype(np.float64), mod)
+            assert np.array_equal(res, get_centered_remainder(x, mod))
+
+    @unittest.skipIf(_modarith is None, "the C extension bfv._modarith is not built")
+    def test_modarith_matches_python(self):
+        for mod in [2, 7, 65536, 65537, 1152921504606584833, 2**63 - 1]:
+            x = [random.randint(-(2**63), 2**63 - 1) for _ in range(1000)]
+            x += [-(2**63), 2**63 - 1, 0, mod // 2, -(mod // 2), mod // 2 + 1, -(mod // 2) - 1]
+            x = np.array(x, dtype=np.int64)
+
+            # compare the batched reductions against the reductions of each coefficient as a Python integer
+            centered = get_centered_remainder(x, mod)
+            standard = get_standard_form(x, mod)
+            self.assertEqual(centered.dtype, np.int64)
+            self.assertEqual(centered.tolist(), [get_centered_remainder(int(v), mod) for v in x])
+            self.assertEqual(standard.tolist(), [get_standard_form(int(v), mod) for v in x])
+
+            # the output may be the input array itself
+            _modarith.centered_remainder(x, mod, x)
+            self.assertTrue(np.array_equal(x, centered))
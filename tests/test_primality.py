@@ -0,0 +1,28 @@
+import unittest
+from bfv.primality import is_probable_prime, small_primes
+
+
+class TestPrimality(unittest.TestCase):
+
+    def test_small_numbers(self):
+        # compare against the sieve of Eratosthenes
+        primes = set(small_primes(100000))
+        for n in range(100000):
+            self.assertEqual(is_probable_prime(n), n in primes)
+
+    def test_ntt_primes(self):
+        qis = [1152921504606584833, 1152921504598720513, 1152921504580894721, 65537]
+        for qi in qis:
+            self.assertTrue(is_probable_prime(qi))
+
+    def test_pseudoprimes(self):
+        # Carmichael numbers and strong pseudoprimes to the bases 2, 3, 5, 7
+        composites = [561, 1105, 2047, 1373653, 25326001, 3215031751, 2152302898747, 3474749660383, 341550071728321]
+        for n in composites:
+            self.assertFalse(is_probable_prime(n))
+
+    def test_large_composites(self):
+        p = 1152921504606584833
+        q = 1152921504598720513
+        self.assertFalse(is_probable_prime(p * q))
+        self.assertFalse(is_probable_prime(p * p))